@@ -21,6 +21,16 @@ def setup_environment():
     if str(src_dir) not in sys.path:
         sys.path.insert(0, str(src_dir))
 
+def install_uvloop():
+    """如果安装了uvloop，使用它替换默认事件循环"""
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    
+    uvloop.install()
+    return True
+
 async def run_mcp_server():
     """运行MCP服务器"""
     print("🧠 AI Context Memory MCP Server")
@@ -28,7 +38,7 @@ async def run_mcp_server():
     
     try:
         # 导入必要模块
-        from mcp.server import Server
+        from mcp.server import Server, NotificationOptions
         from mcp.server.models import InitializationOptions
         import mcp.server.stdio
         import mcp.types as types
@@ -56,20 +66,22 @@ async def run_mcp_server():
         print("🚀 MCP服务器启动中...")
         print("\n按 Ctrl+C 停止服务器\n")
         
+        # 工具注册完成后计算一次服务器能力，运行时直接复用
+        capabilities = server.get_capabilities(
+            notification_options=NotificationOptions(),
+            experimental_capabilities={}
+        )
+        
+        # 初始化选项只依赖固定参数，预先构建好
+        init_options = InitializationOptions(
+            server_name="ai-context-memory",
+            server_version="1.0.0",
+            capabilities=capabilities
+        )
+        
         # 运行服务器
         async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-            await server.run(
-                read_stream,
-                write_stream,
-                InitializationOptions(
-                    server_name="ai-context-memory",
-                    server_version="1.0.0",
-                    capabilities=server.get_capabilities(
-                        notification_options=None,
-                        experimental_capabilities={}
-                    )
-                )
-            )
+            await server.run(read_stream, write_stream, init_options)
     
     except ImportError as e:
         print(f"❌ 模块导入失败: {e}")
@@ -91,13 +103,16 @@ def main():
     # 设置环境
     setup_environment()
     
-    # 设置日志
+    # 设置日志（级别映射与memory.server共用一份）
+    from memory.server import LOG_LEVELS
     log_level = os.environ.get("LOG_LEVEL", "INFO")
     logging.basicConfig(
-        level=getattr(logging, log_level.upper()),
+        level=LOG_LEVELS.get(log_level.upper(), logging.INFO),
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     
+    install_uvloop()
+    
     try:
         asyncio.run(run_mcp_server())
     except KeyboardInterrupt:
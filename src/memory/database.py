@@ -2,55 +2,208 @@
 Database Manager for SQLite operations.
 """
 
+import asyncio
+from contextlib import asynccontextmanager
 import sqlite3
 import aiosqlite
 from typing import List, Dict, Any, Optional, Tuple
 import logging
 import os
+import stat
+from operator import itemgetter
 
 logger = logging.getLogger(__name__)
 
+# INSERT ... RETURNING needs SQLite 3.35+
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Page cache per connection, in KiB when negative (~64 MB)
+CACHE_SIZE_KIB = 64000
+
+# Memory-mapped I/O window for file databases (256 MB)
+MMAP_SIZE = 268435456
+
+# Per-connection settings, sent as one script to save worker-thread hops.
+# Foreign keys must be enabled on every connection for cascades to fire, and
+# under WAL synchronous=NORMAL avoids an fsync per commit.
+_CONNECTION_PRAGMAS = f"""
+    PRAGMA foreign_keys = ON;
+    PRAGMA cache_size = -{CACHE_SIZE_KIB};
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA mmap_size = {MMAP_SIZE};
+"""
+
+# Hot statements are kept as single constants so every caller passes the
+# identical string and sqlite3's per-connection statement cache always hits.
+_SQL_INSERT_MEMORY = """
+    INSERT INTO memories (content, memory_type, context, created_at, updated_at)
+    VALUES (?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+"""
+_SQL_INSERT_MEMORY_RETURNING = _SQL_INSERT_MEMORY + "RETURNING *"
+_SQL_SELECT_MEMORY_BY_ID = "SELECT * FROM memories WHERE id = ?"
+_SQL_TOUCH_MEMORY = """
+    UPDATE memories
+    SET access_count = access_count + 1, last_accessed = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+_SQL_SELECT_MEMORY_TAG_NAMES = """
+    SELECT t.name FROM tags t
+    JOIN memory_tags mt ON t.id = mt.tag_id
+    WHERE mt.memory_id = ?
+"""
+_SQL_SELECT_TAG_ID = "SELECT id FROM tags WHERE name = ?"
+_SQL_INSERT_TAG = "INSERT INTO tags (name) VALUES (?)"
+_SQL_INSERT_MEMORY_TAG = "INSERT OR IGNORE INTO memory_tags (memory_id, tag_id) VALUES (?, ?)"
+
+# External-content FTS5 index over memories.content, kept in sync by triggers
+_SQL_CREATE_FTS = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
+        content, content='memories', content_rowid='id', tokenize='trigram'
+    );
+    CREATE TRIGGER IF NOT EXISTS memories_fts_insert AFTER INSERT ON memories BEGIN
+        INSERT INTO memories_fts(rowid, content) VALUES (new.id, new.content);
+    END;
+    CREATE TRIGGER IF NOT EXISTS memories_fts_delete AFTER DELETE ON memories BEGIN
+        INSERT INTO memories_fts(memories_fts, rowid, content)
+        VALUES ('delete', old.id, old.content);
+    END;
+    CREATE TRIGGER IF NOT EXISTS memories_fts_update AFTER UPDATE OF content ON memories BEGIN
+        INSERT INTO memories_fts(memories_fts, rowid, content)
+        VALUES ('delete', old.id, old.content);
+        INSERT INTO memories_fts(rowid, content) VALUES (new.id, new.content);
+    END;
+"""
+
+# Narrows LIKE candidates through the trigram index; the outer LIKE keeps
+# SQLite's exact (ASCII-only case folding) semantics
+_SQL_FTS_CONTENT_LIKE = (
+    "m.id IN (SELECT rowid FROM memories_fts WHERE content LIKE ?) "
+    "AND m.content LIKE ?"
+)
+
+# Extracts tag names in C instead of a per-row Python comprehension
+_tag_name = itemgetter('name')
+
+def _prepare_db_path(db_path: str):
+    """Ensure the database file's directory exists.
+    
+    An existing database costs a single stat() call; the directory is only
+    created when the file is missing.
+    """
+    try:
+        st = os.stat(db_path)
+    except FileNotFoundError:
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+    else:
+        if not stat.S_ISREG(st.st_mode):
+            raise ValueError(f"Database path is not a regular file: {db_path}")
+
+def _is_memory_database(db_path: str, uri: bool) -> bool:
+    """Whether db_path names an in-memory database that dies with its last connection."""
+    if db_path == ":memory:":
+        return True
+    return uri and (db_path.startswith("file::memory:") or "mode=memory" in db_path)
+
 class DatabaseManager:
     """SQLite database manager for memory storage."""
     
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, uri: bool = False):
         if db_path is None:
             # 使用用户主目录下的.ai-context-memory文件夹
+            # 目录在initialize()中由_prepare_db_path按需创建
             from pathlib import Path
-            data_dir = Path.home() / ".ai-context-memory"
-            data_dir.mkdir(exist_ok=True)
-            db_path = str(data_dir / "memories.db")
+            db_path = str(Path.home() / ".ai-context-memory" / "memories.db")
         self.db_path = db_path
+        self.uri = uri  # Interpret db_path as a "file:" URI
+        self._in_memory = _is_memory_database(db_path, uri)
         self._initialized = False
         self._connection = None  # For in-memory databases
+        self._tag_ids: Dict[str, int] = {}  # Tag name -> id cache
+        self._fts_enabled = False  # Set by _setup_fts()
         
     async def initialize(self):
         """Initialize database and create tables."""
         try:
-            # Create directory if it doesn't exist
-            db_dir = os.path.dirname(self.db_path)
-            if db_dir and not os.path.exists(db_dir):
-                os.makedirs(db_dir)
-            
             # For in-memory databases, keep a persistent connection
-            if self.db_path == ":memory:":
-                self._connection = await aiosqlite.connect(self.db_path)
+            if self._in_memory:
+                self._connection = await self._connect()
                 await self._setup_database(self._connection)
             else:
-                async with aiosqlite.connect(self.db_path) as db:
+                if not self.uri:
+                    # Filesystem checks may block on slow or network disks
+                    loop = asyncio.get_running_loop()
+                    await loop.run_in_executor(None, _prepare_db_path, self.db_path)
+                db = await self._connect()
+                try:
                     await self._setup_database(db)
+                finally:
+                    await db.close()
                 
             self._initialized = True
-            logger.info(f"Database initialized successfully at {self.db_path}")
+            logger.info("Database initialized successfully at %s", self.db_path)
                 
         except Exception as e:
-            logger.error(f"Failed to initialize database: {e}")
+            logger.error("Failed to initialize database: %s", e)
             raise
             
+    async def _connect(self) -> aiosqlite.Connection:
+        """Open a connection in autocommit mode with dict-friendly rows.
+        
+        Statements outside execute_transaction() commit on their own;
+        transactions are started and ended explicitly.
+        """
+        db = await aiosqlite.connect(
+            self.db_path, isolation_level=None, uri=self.uri
+        )
+        db.row_factory = aiosqlite.Row
+        await db.executescript(_CONNECTION_PRAGMAS)
+        return db
+        
+    @asynccontextmanager
+    async def _session(self):
+        """Yield the persistent in-memory connection or a fresh file connection."""
+        if self._connection:
+            yield self._connection
+            return
+        db = await self._connect()
+        try:
+            # Ensure initialization for file databases
+            if not self._initialized:
+                await self._setup_database(db)
+                self._initialized = True
+            yield db
+        finally:
+            await db.close()
+        
+    @asynccontextmanager
+    async def _transaction(self, db):
+        """Wrap the block in BEGIN IMMEDIATE ... COMMIT, rolling back on error."""
+        await db.execute("BEGIN IMMEDIATE")
+        try:
+            # Check foreign keys once at COMMIT; resets when the transaction ends
+            await db.execute("PRAGMA defer_foreign_keys = ON")
+            yield db
+            # Deferred constraint violations surface here
+            await db.execute("COMMIT")
+        except BaseException:
+            await db.execute("ROLLBACK")
+            raise
+        
+    async def _run_transaction(self, db, queries: List[Tuple[str, Tuple]]):
+        """Run queries on db inside a single BEGIN IMMEDIATE ... COMMIT."""
+        async with self._transaction(db):
+            for query, params in queries:
+                await db.execute(query, params)
+        
     async def _setup_database(self, db):
         """Setup database tables and indexes."""
-        # Enable foreign key constraints
-        await db.execute("PRAGMA foreign_keys = ON")
+        # Journal mode is stored in the database file, so once is enough.
+        # In-memory databases keep their "memory" journal.
+        if not self._in_memory:
+            await db.execute("PRAGMA journal_mode = WAL")
         
         # Create memories table
         await db.execute("""
@@ -86,10 +239,13 @@ class DatabaseManager:
         """)
         
         # Create indexes for better performance
+        # Serves type filters together with the created_at ordering; it
+        # supersedes the older single-column idx_memories_type
         await db.execute("""
-            CREATE INDEX IF NOT EXISTS idx_memories_type 
-            ON memories(memory_type)
+            CREATE INDEX IF NOT EXISTS idx_memories_type_created 
+            ON memories(memory_type, created_at)
         """)
+        await db.execute("DROP INDEX IF EXISTS idx_memories_type")
         
         await db.execute("""
             CREATE INDEX IF NOT EXISTS idx_memories_created 
@@ -106,7 +262,38 @@ class DatabaseManager:
             ON tags(name)
         """)
         
-        await db.commit()
+        # The primary key covers lookups by memory; this covers lookups by tag
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_memory_tags_tag 
+            ON memory_tags(tag_id, memory_id)
+        """)
+        
+        self._fts_enabled = await self._setup_fts(db)
+        
+        # Refresh planner statistics; analysis_limit bounds the cost on
+        # large databases
+        await db.executescript("PRAGMA analysis_limit = 1000; ANALYZE;")
+        
+    async def _setup_fts(self, db) -> bool:
+        """Create the trigram full-text index over memory content.
+        
+        The trigram tokenizer lets FTS5 answer LIKE '%text%' from its index
+        instead of scanning every row. Returns False when this SQLite build
+        has no FTS5 or trigram support, in which case plain LIKE is used.
+        """
+        cursor = await db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'memories_fts'"
+        )
+        exists = await cursor.fetchone() is not None
+        try:
+            await db.executescript(_SQL_CREATE_FTS)
+        except sqlite3.OperationalError as e:
+            logger.warning("Full-text index unavailable, using LIKE scans: %s", e)
+            return False
+        if not exists:
+            # Index memories stored before the FTS table existed
+            await db.execute("INSERT INTO memories_fts(memories_fts) VALUES ('rebuild')")
+        return True
         
     async def execute_query(
         self, 
@@ -115,26 +302,46 @@ class DatabaseManager:
     ) -> List[Dict[str, Any]]:
         """Execute a SELECT query and return results."""
         try:
-            # Use persistent connection for in-memory databases
-            if self._connection:
-                db = self._connection
-                db.row_factory = aiosqlite.Row
+            async with self._session() as db:
+                # One fetchall() hop to the worker thread instead of one per row
                 cursor = await db.execute(query, params or ())
                 rows = await cursor.fetchall()
                 return [dict(row) for row in rows]
-            else:
-                async with aiosqlite.connect(self.db_path) as db:
-                    # Ensure initialization for file databases
-                    if not self._initialized:
-                        await self._setup_database(db)
-                        self._initialized = True
-                        
-                    db.row_factory = aiosqlite.Row
-                    cursor = await db.execute(query, params or ())
-                    rows = await cursor.fetchall()
-                    return [dict(row) for row in rows]
         except Exception as e:
-            logger.error(f"Query execution failed: {e}")
+            logger.error("Query execution failed: %s", e)
+            raise
+        
+    async def execute_query_columns(
+        self, 
+        query: str, 
+        params: Optional[Tuple] = None
+    ) -> Dict[str, List[Any]]:
+        """Execute a SELECT query and return a column name -> values mapping."""
+        try:
+            async with self._session() as db:
+                cursor = await db.execute(query, params or ())
+                rows = await cursor.fetchall()
+                names = [column[0] for column in cursor.description]
+                if not rows:
+                    return {name: [] for name in names}
+                return dict(zip(names, map(list, zip(*rows))))
+        except Exception as e:
+            logger.error("Query execution failed: %s", e)
+            raise
+        
+    async def execute_many(
+        self, 
+        query: str, 
+        params_seq: List[Tuple]
+    ) -> int:
+        """Execute one statement for each parameter tuple in a single transaction."""
+        try:
+            async with self._session() as db:
+                async with self._transaction(db):
+                    cursor = await db.executemany(query, params_seq)
+                return cursor.rowcount
+        except Exception as e:
+            logger.error("Batch execution failed: %s", e)
             raise
         
     async def execute_update(
@@ -144,24 +351,11 @@ class DatabaseManager:
     ) -> int:
         """Execute an INSERT/UPDATE/DELETE query and return affected rows."""
         try:
-            # Use persistent connection for in-memory databases
-            if self._connection:
-                db = self._connection
+            async with self._session() as db:
                 cursor = await db.execute(query, params or ())
-                await db.commit()
                 return cursor.rowcount
-            else:
-                async with aiosqlite.connect(self.db_path) as db:
-                    # Ensure initialization for file databases
-                    if not self._initialized:
-                        await self._setup_database(db)
-                        self._initialized = True
-                        
-                    cursor = await db.execute(query, params or ())
-                    await db.commit()
-                    return cursor.rowcount
         except Exception as e:
-            logger.error(f"Update execution failed: {e}")
+            logger.error("Update execution failed: %s", e)
             raise
             
     async def execute_insert(
@@ -171,81 +365,87 @@ class DatabaseManager:
     ) -> int:
         """Execute an INSERT query and return the last row ID."""
         try:
-            # Use persistent connection for in-memory databases
-            if self._connection:
-                db = self._connection
+            async with self._session() as db:
                 cursor = await db.execute(query, params or ())
-                await db.commit()
                 return cursor.lastrowid
-            else:
-                async with aiosqlite.connect(self.db_path) as db:
-                    # Ensure initialization for file databases
-                    if not self._initialized:
-                        await self._setup_database(db)
-                        self._initialized = True
-                        
-                    cursor = await db.execute(query, params or ())
-                    await db.commit()
-                    return cursor.lastrowid
         except Exception as e:
-            logger.error(f"Insert execution failed: {e}")
+            logger.error("Insert execution failed: %s", e)
             raise
         
     async def execute_transaction(self, queries: List[Tuple[str, Tuple]]) -> bool:
         """Execute multiple queries in a transaction."""
         try:
-            # Use persistent connection for in-memory databases
-            if self._connection:
-                db = self._connection
-                async with db.execute("BEGIN"):
-                    for query, params in queries:
-                        await db.execute(query, params)
-                    await db.commit()
+            async with self._session() as db:
+                await self._run_transaction(db, queries)
                 return True
-            else:
-                async with aiosqlite.connect(self.db_path) as db:
-                    # Ensure initialization for file databases
-                    if not self._initialized:
-                        await self._setup_database(db)
-                        self._initialized = True
-                        
-                    async with db.execute("BEGIN"):
-                        for query, params in queries:
-                            await db.execute(query, params)
-                        await db.commit()
-                    return True
         except Exception as e:
-            logger.error(f"Transaction execution failed: {e}")
+            logger.error("Transaction execution failed: %s", e)
             raise
             
     async def get_or_create_tag(self, tag_name: str) -> int:
         """Get existing tag ID or create new tag and return its ID."""
+        tag_id = self._tag_ids.get(tag_name)
+        if tag_id is not None:
+            return tag_id
+        
         try:
             # Try to get existing tag
-            result = await self.execute_query(
-                "SELECT id FROM tags WHERE name = ?", 
-                (tag_name,)
-            )
+            result = await self.execute_query(_SQL_SELECT_TAG_ID, (tag_name,))
             
             if result:
-                return result[0]['id']
+                tag_id = result[0]['id']
+            else:
+                # Create new tag if it doesn't exist
+                tag_id = await self.execute_insert(_SQL_INSERT_TAG, (tag_name,))
             
-            # Create new tag if it doesn't exist
-            tag_id = await self.execute_insert(
-                "INSERT INTO tags (name) VALUES (?)", 
-                (tag_name,)
-            )
+            self._tag_ids[tag_name] = tag_id
             return tag_id
             
         except Exception as e:
-            logger.error(f"Failed to get or create tag '{tag_name}': {e}")
+            logger.error("Failed to get or create tag '%s': %s", tag_name, e)
             raise
             
+    async def _resolve_tag_ids(
+        self, db: aiosqlite.Connection, tag_names: List[str]
+    ) -> Dict[str, int]:
+        """Map tag names to IDs on db, creating missing tags in one batch.
+        
+        Must run inside a transaction. The result is not put into the tag
+        ID cache here; callers do that once the transaction has committed,
+        so a rollback cannot leave IDs for tags that were never stored.
+        """
+        tag_ids = {}
+        missing = []
+        for name in dict.fromkeys(tag_names):
+            tag_id = self._tag_ids.get(name)
+            if tag_id is None:
+                missing.append(name)
+            else:
+                tag_ids[name] = tag_id
+        if missing:
+            await db.executemany(
+                "INSERT OR IGNORE INTO tags (name) VALUES (?)",
+                [(name,) for name in missing]
+            )
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                cursor = await db.execute(
+                    f"SELECT id, name FROM tags WHERE name IN ({placeholders})",
+                    chunk
+                )
+                for row in await cursor.fetchall():
+                    tag_ids[row['name']] = row['id']
+        return tag_ids
+            
     async def close(self):
         """Close database connection (for cleanup)."""
         if self._connection:
             await self._connection.close()
             self._connection = None
+            # The in-memory database and its tag ids are gone
+            self._tag_ids.clear()
             
     # Memory CRUD Operations
     async def create_memory(
@@ -257,45 +457,83 @@ class DatabaseManager:
     ) -> int:
         """Create a new memory and return its ID."""
         try:
-            # Insert the memory
-            memory_id = await self.execute_insert(
-                """INSERT INTO memories (content, memory_type, context) 
-                   VALUES (?, ?, ?)""",
-                (content, memory_type, context)
-            )
-            
-            # Add tags if provided
-            if tags:
-                tag_queries = []
-                for tag_name in tags:
-                    tag_id = await self.get_or_create_tag(tag_name)
-                    tag_queries.append((
-                        "INSERT OR IGNORE INTO memory_tags (memory_id, tag_id) VALUES (?, ?)",
-                        (memory_id, tag_id)
-                    ))
-                
-                if tag_queries:
-                    await self.execute_transaction(tag_queries)
+            tag_ids = {}
+            async with self._session() as db:
+                async with self._transaction(db):
+                    # Insert the memory
+                    cursor = await db.execute(
+                        _SQL_INSERT_MEMORY,
+                        (content, memory_type, context)
+                    )
+                    memory_id = cursor.lastrowid
+                    
+                    # Add tags if provided
+                    if tags:
+                        tag_ids = await self._resolve_tag_ids(db, tags)
+                        await db.executemany(
+                            _SQL_INSERT_MEMORY_TAG,
+                            [(memory_id, tag_ids[tag]) for tag in tags]
+                        )
+            self._tag_ids.update(tag_ids)
             
             return memory_id
             
         except Exception as e:
-            logger.error(f"Failed to create memory: {e}")
+            logger.error("Failed to create memory: %s", e)
+            raise
+            
+    async def create_memories_bulk(
+        self,
+        memories: List[Tuple[str, str, Optional[str], Optional[List[str]]]]
+    ) -> List[int]:
+        """Create many (content, memory_type, context, tags) memories at once.
+        
+        Everything runs in one transaction with executemany(), so the cost is
+        a handful of worker-thread hops rather than several per memory.
+        Returns the new IDs in input order.
+        """
+        if not memories:
+            return []
+        try:
+            async with self._session() as db:
+                async with self._transaction(db):
+                    # BEGIN IMMEDIATE holds the write lock, so the AUTOINCREMENT
+                    # ids handed out below are consecutive and above this one
+                    cursor = await db.execute("SELECT COALESCE(MAX(id), 0) FROM memories")
+                    (last_id,) = await cursor.fetchone()
+                    await db.executemany(
+                        _SQL_INSERT_MEMORY,
+                        [(content, memory_type, context)
+                         for content, memory_type, context, _ in memories]
+                    )
+                    cursor = await db.execute(
+                        "SELECT id FROM memories WHERE id > ? ORDER BY id",
+                        (last_id,)
+                    )
+                    memory_ids = [row[0] for row in await cursor.fetchall()]
+                    
+                    tag_ids = await self._resolve_tag_ids(
+                        db, [tag for *_, tags in memories if tags for tag in tags]
+                    )
+                    if tag_ids:
+                        await db.executemany(
+                            _SQL_INSERT_MEMORY_TAG,
+                            [(memory_id, tag_ids[tag])
+                             for memory_id, (*_, tags) in zip(memory_ids, memories)
+                             if tags for tag in tags]
+                        )
+            self._tag_ids.update(tag_ids)
+            return memory_ids
+            
+        except Exception as e:
+            logger.error("Failed to create memories: %s", e)
             raise
             
     async def get_memory(self, memory_id: int) -> Optional[Dict[str, Any]]:
         """Get a memory by ID with its tags."""
         try:
             # Update access count and last accessed time first
-            updated_rows = await self.execute_update(
-                """UPDATE memories 
-                   SET access_count = access_count + 1, 
-                       last_accessed = CURRENT_TIMESTAMP 
-                   WHERE id = ?""",
-                (memory_id,)
-            )
-            
-            if updated_rows == 0:
+            if not await self.update_memory_access(memory_id):
                 return None  # Memory doesn't exist
             
             # Get memory details (now with updated access count)
@@ -313,18 +551,16 @@ class DatabaseManager:
             
             # Get associated tags
             tags = await self.execute_query(
-                """SELECT t.name FROM tags t 
-                   JOIN memory_tags mt ON t.id = mt.tag_id 
-                   WHERE mt.memory_id = ?""",
+                _SQL_SELECT_MEMORY_TAG_NAMES,
                 (memory_id,)
             )
             
-            memory['tags'] = [tag['name'] for tag in tags]
+            memory['tags'] = list(map(_tag_name, tags))
             
             return memory
             
         except Exception as e:
-            logger.error(f"Failed to get memory {memory_id}: {e}")
+            logger.error("Failed to get memory %s: %s", memory_id, e)
             raise
             
     async def update_memory(
@@ -370,43 +606,119 @@ class DatabaseManager:
             
             # Update tags if provided
             if tags is not None:
-                # Remove existing tags
-                await self.execute_update(
-                    "DELETE FROM memory_tags WHERE memory_id = ?",
-                    (memory_id,)
-                )
-                
-                # Add new tags
-                if tags:
-                    tag_queries = []
-                    for tag_name in tags:
-                        tag_id = await self.get_or_create_tag(tag_name)
-                        tag_queries.append((
-                            "INSERT INTO memory_tags (memory_id, tag_id) VALUES (?, ?)",
-                            (memory_id, tag_id)
-                        ))
-                    
-                    await self.execute_transaction(tag_queries)
+                tag_ids = {}
+                async with self._session() as db:
+                    async with self._transaction(db):
+                        # Remove existing tags
+                        await db.execute(
+                            "DELETE FROM memory_tags WHERE memory_id = ?",
+                            (memory_id,)
+                        )
+                        
+                        # Add new tags
+                        if tags:
+                            tag_ids = await self._resolve_tag_ids(db, tags)
+                            await db.executemany(
+                                _SQL_INSERT_MEMORY_TAG,
+                                [(memory_id, tag_ids[tag]) for tag in tags]
+                            )
+                self._tag_ids.update(tag_ids)
             
             return True
             
         except Exception as e:
-            logger.error(f"Failed to update memory {memory_id}: {e}")
+            logger.error("Failed to update memory %s: %s", memory_id, e)
             raise
             
-    async def delete_memory(self, memory_id: int) -> bool:
-        """Delete a memory by ID."""
-        try:
-            affected_rows = await self.execute_update(
-                "DELETE FROM memories WHERE id = ?",
-                (memory_id,)
+    def _content_condition(self, text: str) -> Tuple[str, Tuple]:
+        """SQL condition matching memories whose content contains text."""
+        pattern = f"%{text}%"
+        # A trigram index cannot answer patterns shorter than three characters
+        # (and older SQLite mishandles short multibyte ones), so those go
+        # straight to the LIKE scan
+        if self._fts_enabled and len(text) >= 3:
+            return f"({_SQL_FTS_CONTENT_LIKE})", (pattern, pattern)
+        return "m.content LIKE ?", (pattern,)
+        
+    def _build_search_query(
+        self,
+        query: Optional[str],
+        memory_type: Optional[str],
+        tags: Optional[List[str]],
+        limit: Optional[int],
+        offset: Optional[int]
+    ) -> Tuple[str, Tuple]:
+        """Build the SQL and parameters shared by the search_memories variants."""
+        sql_parts = [
+            """SELECT DISTINCT m.id, m.content, m.memory_type, m.context, 
+                      m.created_at, m.updated_at, m.access_count, m.last_accessed
+               FROM memories m"""
+        ]
+        params = []
+        conditions = []
+        
+        # Join with tags if needed
+        if tags:
+            sql_parts.append(
+                """LEFT JOIN memory_tags mt ON m.id = mt.memory_id
+                   LEFT JOIN tags t ON mt.tag_id = t.id"""
             )
-            return affected_rows > 0
+        
+        # Add WHERE conditions
+        if query:
+            condition, condition_params = self._content_condition(query)
+            conditions.append(condition)
+            params.extend(condition_params)
             
-        except Exception as e:
-            logger.error(f"Failed to delete memory {memory_id}: {e}")
-            raise
+        if memory_type:
+            conditions.append("m.memory_type = ?")
+            params.append(memory_type)
             
+        if tags:
+            tag_placeholders = ",".join("?" * len(tags))
+            conditions.append(f"t.name IN ({tag_placeholders})")
+            params.extend(tags)
+        
+        if conditions:
+            sql_parts.append("WHERE " + " AND ".join(conditions))
+        
+        # Add ordering
+        sql_parts.append("ORDER BY m.created_at DESC")
+        
+        # Add pagination
+        if limit:
+            sql_parts.append("LIMIT ?")
+            params.append(limit)
+            
+        if offset:
+            sql_parts.append("OFFSET ?")
+            params.append(offset)
+        
+        return " ".join(sql_parts), tuple(params)
+        
+    async def _attach_tags(self, memories: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fill in memory['tags'] for all rows with one query per 500 ids."""
+        tags_by_id: Dict[int, List[str]] = {}
+        for memory in memories:
+            memory['tags'] = tags_by_id.setdefault(memory['id'], [])
+        
+        memory_ids = list(tags_by_id)
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(memory_ids), 500):
+            chunk = memory_ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = await self.execute_query(
+                f"""SELECT mt.memory_id, t.name FROM memory_tags mt
+                    JOIN tags t ON t.id = mt.tag_id
+                    WHERE mt.memory_id IN ({placeholders})
+                    ORDER BY mt.memory_id, mt.tag_id""",
+                tuple(chunk)
+            )
+            for row in rows:
+                tags_by_id[row['memory_id']].append(row['name'])
+        
+        return memories
+        
     async def search_memories(
         self,
         query: Optional[str] = None,
@@ -417,68 +729,37 @@ class DatabaseManager:
     ) -> List[Dict[str, Any]]:
         """Search memories with various filters."""
         try:
-            # Build the SQL query dynamically
-            sql_parts = [
-                """SELECT DISTINCT m.id, m.content, m.memory_type, m.context, 
-                          m.created_at, m.updated_at, m.access_count, m.last_accessed
-                   FROM memories m"""
-            ]
-            params = []
-            conditions = []
-            
-            # Join with tags if needed
-            if tags:
-                sql_parts.append(
-                    """LEFT JOIN memory_tags mt ON m.id = mt.memory_id
-                       LEFT JOIN tags t ON mt.tag_id = t.id"""
-                )
-            
-            # Add WHERE conditions
-            if query:
-                conditions.append("m.content LIKE ?")
-                params.append(f"%{query}%")
-                
-            if memory_type:
-                conditions.append("m.memory_type = ?")
-                params.append(memory_type)
-                
-            if tags:
-                tag_placeholders = ",".join("?" * len(tags))
-                conditions.append(f"t.name IN ({tag_placeholders})")
-                params.extend(tags)
-            
-            if conditions:
-                sql_parts.append("WHERE " + " AND ".join(conditions))
-            
-            # Add ordering
-            sql_parts.append("ORDER BY m.created_at DESC")
-            
-            # Add pagination
-            if limit:
-                sql_parts.append("LIMIT ?")
-                params.append(limit)
-                
-            if offset:
-                sql_parts.append("OFFSET ?")
-                params.append(offset)
-            
-            sql = " ".join(sql_parts)
-            memories = await self.execute_query(sql, tuple(params))
+            sql, params = self._build_search_query(
+                query, memory_type, tags, limit, offset
+            )
+            memories = await self.execute_query(sql, params)
             
-            # Get tags for each memory
-            for memory in memories:
-                memory_tags = await self.execute_query(
-                    """SELECT t.name FROM tags t 
-                       JOIN memory_tags mt ON t.id = mt.tag_id 
-                       WHERE mt.memory_id = ?""",
-                    (memory['id'],)
-                )
-                memory['tags'] = [tag['name'] for tag in memory_tags]
+            return await self._attach_tags(memories)
             
-            return memories
+        except Exception as e:
+            logger.error("Failed to search memories: %s", e)
+            raise
             
+    async def search_memories_columnar(
+        self,
+        query: Optional[str] = None,
+        memory_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None
+    ) -> Dict[str, List[Any]]:
+        """Search memories like search_memories(), returning one list per column.
+        
+        No per-row dicts are built and tags are not attached, which suits
+        callers that only scan a column or two (e.g. collecting ids).
+        """
+        try:
+            sql, params = self._build_search_query(
+                query, memory_type, tags, limit, offset
+            )
+            return await self.execute_query_columns(sql, params)
         except Exception as e:
-            logger.error(f"Failed to search memories: {e}")
+            logger.error("Failed to search memories: %s", e)
             raise
             
     async def list_memories(
@@ -510,20 +791,10 @@ class DatabaseManager:
             
             memories = await self.execute_query(sql, tuple(params))
             
-            # Get tags for each memory
-            for memory in memories:
-                memory_tags = await self.execute_query(
-                    """SELECT t.name FROM tags t 
-                       JOIN memory_tags mt ON t.id = mt.tag_id 
-                       WHERE mt.memory_id = ?""",
-                    (memory['id'],)
-                )
-                memory['tags'] = [tag['name'] for tag in memory_tags]
-            
-            return memories
+            return await self._attach_tags(memories)
             
         except Exception as e:
-            logger.error(f"Failed to list memories: {e}")
+            logger.error("Failed to list memories: %s", e)
             raise
             
     async def clear_memories(self, memory_type: Optional[str] = None) -> int:
@@ -540,18 +811,10 @@ class DatabaseManager:
             return affected_rows
             
         except Exception as e:
-            logger.error(f"Failed to clear memories: {e}")
+            logger.error("Failed to clear memories: %s", e)
             raise
             
     # Tag CRUD Operations
-    async def get_all_tags(self) -> List[Dict[str, Any]]:
-        """Get all tags."""
-        try:
-            return await self.execute_query("SELECT id, name FROM tags ORDER BY name")
-        except Exception as e:
-            logger.error(f"Failed to get all tags: {e}")
-            raise
-            
     async def delete_unused_tags(self) -> int:
         """Delete tags that are not associated with any memories."""
         try:
@@ -560,26 +823,11 @@ class DatabaseManager:
                        SELECT DISTINCT tag_id FROM memory_tags
                    )"""
             )
+            if affected_rows:
+                self._tag_ids.clear()
             return affected_rows
         except Exception as e:
-            logger.error(f"Failed to delete unused tags: {e}")
-            raise
-            
-    async def get_memory_count(self, memory_type: Optional[str] = None) -> int:
-        """Get count of memories, optionally filtered by type."""
-        try:
-            if memory_type:
-                result = await self.execute_query(
-                    "SELECT COUNT(*) as count FROM memories WHERE memory_type = ?",
-                    (memory_type,)
-                )
-            else:
-                result = await self.execute_query("SELECT COUNT(*) as count FROM memories")
-            
-            return result[0]['count'] if result else 0
-            
-        except Exception as e:
-            logger.error(f"Failed to get memory count: {e}")
+            logger.error("Failed to delete unused tags: %s", e)
             raise
             
     # Memory CRUD operations
@@ -590,16 +838,28 @@ class DatabaseManager:
         context: Optional[str] = None
     ) -> int:
         """Insert a new memory and return its ID."""
-        query = """
-            INSERT INTO memories (content, memory_type, context, created_at, updated_at)
-            VALUES (?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-        """
-        return await self.execute_insert(query, (content, memory_type, context))
+        return await self.execute_insert(
+            _SQL_INSERT_MEMORY, (content, memory_type, context)
+        )
+        
+    async def insert_memory_returning(
+        self,
+        content: str,
+        memory_type: str,
+        context: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Insert a new memory and return the stored row in one round trip."""
+        if not _HAS_RETURNING:
+            memory_id = await self.insert_memory(content, memory_type, context)
+            return await self.get_memory_by_id(memory_id)
+        results = await self.execute_query(
+            _SQL_INSERT_MEMORY_RETURNING, (content, memory_type, context)
+        )
+        return results[0]
         
     async def get_memory_by_id(self, memory_id: int) -> Optional[Dict[str, Any]]:
         """Get a memory by its ID."""
-        query = "SELECT * FROM memories WHERE id = ?"
-        results = await self.execute_query(query, (memory_id,))
+        results = await self.execute_query(_SQL_SELECT_MEMORY_BY_ID, (memory_id,))
         return results[0] if results else None
         
     async def update_memory_content(self, memory_id: int, content: str) -> bool:
@@ -614,13 +874,17 @@ class DatabaseManager:
         
     async def update_memory_access(self, memory_id: int) -> bool:
         """Update memory access count and last_accessed timestamp."""
+        affected_rows = await self.execute_update(_SQL_TOUCH_MEMORY, (memory_id,))
+        return affected_rows > 0
+        
+    async def add_memory_accesses(self, accesses: List[Tuple[int, str, int]]) -> int:
+        """Apply (extra access count, last_accessed, memory id) updates in one batch."""
         query = """
             UPDATE memories 
-            SET access_count = access_count + 1, last_accessed = CURRENT_TIMESTAMP 
+            SET access_count = access_count + ?, last_accessed = ? 
             WHERE id = ?
         """
-        affected_rows = await self.execute_update(query, (memory_id,))
-        return affected_rows > 0
+        return await self.execute_many(query, accesses)
         
     async def delete_memory(self, memory_id: int) -> bool:
         """Delete a memory by ID."""
@@ -709,6 +973,16 @@ class DatabaseManager:
         query = "DELETE FROM memories"
         return await self.execute_update(query)
         
+    async def truncate_all(self):
+        """Delete every memory and tag and restart ID numbering, in one transaction."""
+        await self.execute_transaction([
+            ("DELETE FROM memory_tags", ()),
+            ("DELETE FROM memories", ()),
+            ("DELETE FROM tags", ()),
+            ("DELETE FROM sqlite_sequence WHERE name IN ('memories', 'tags')", ()),
+        ])
+        self._tag_ids.clear()
+        
     # Tag CRUD operations
     async def insert_tag(self, name: str) -> int:
         """Insert a new tag and return its ID."""
@@ -736,12 +1010,17 @@ class DatabaseManager:
         """Delete a tag by ID."""
         query = "DELETE FROM tags WHERE id = ?"
         affected_rows = await self.execute_update(query, (tag_id,))
+        if affected_rows:
+            self._tag_ids = {
+                name: cached_id for name, cached_id in self._tag_ids.items()
+                if cached_id != tag_id
+            }
         return affected_rows > 0
         
     # Memory-Tag association operations
     async def add_memory_tag(self, memory_id: int, tag_id: int) -> bool:
         """Associate a memory with a tag."""
-        query = "INSERT OR IGNORE INTO memory_tags (memory_id, tag_id) VALUES (?, ?)"
+        query = _SQL_INSERT_MEMORY_TAG
         affected_rows = await self.execute_update(query, (memory_id, tag_id))
         return affected_rows > 0
         
@@ -854,6 +1133,136 @@ class DatabaseManager:
             
         return await self.execute_query(base_query, tuple(params))
         
+    def _keywords_condition(
+        self,
+        keywords: List[str],
+        params: List[Any],
+        match_all: bool = False
+    ) -> str:
+        """Combine content matches for keywords with AND/OR, extending params."""
+        conditions = []
+        for keyword in keywords:
+            condition, condition_params = self._content_condition(keyword)
+            conditions.append(condition)
+            params.extend(condition_params)
+        joiner = " AND " if match_all else " OR "
+        return "(" + joiner.join(conditions) + ")"
+        
+    async def search_memories_by_keywords(
+        self,
+        keywords: List[str],
+        match_all: bool = False,
+        memory_type: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Find memories containing any (or all) keywords in one query."""
+        try:
+            params: List[Any] = []
+            conditions = [self._keywords_condition(keywords, params, match_all)]
+            
+            if memory_type:
+                conditions.append("m.memory_type = ?")
+                params.append(memory_type)
+            
+            query = """SELECT m.id, m.content, m.memory_type, m.context, m.created_at,
+                              m.updated_at, m.access_count, m.last_accessed
+                       FROM memories m
+                       WHERE """ + " AND ".join(conditions) + """
+                       ORDER BY m.created_at DESC"""
+            if limit:
+                query += " LIMIT ?"
+                params.append(limit)
+            
+            memories = await self.execute_query(query, tuple(params))
+            return await self._attach_tags(memories)
+            
+        except Exception as e:
+            logger.error("Failed to search memories by keywords: %s", e)
+            raise
+            
+    async def search_memories_unified(
+        self,
+        keywords: Optional[List[str]] = None,
+        tag_names: Optional[List[str]] = None,
+        match_all_tags: bool = False,
+        memory_type: Optional[str] = None,
+        date_from: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Search by keywords, tags, type and date in a single query.
+        
+        Keywords are OR-combined content matches; tags match any or all of
+        the given names. Each memory's tags are fetched in the same query.
+        """
+        conditions = []
+        params = []
+        
+        if keywords:
+            conditions.append(self._keywords_condition(keywords, params))
+        
+        if tag_names:
+            placeholders = ",".join("?" * len(tag_names))
+            tag_filter = f"""m.id IN (
+                SELECT mt.memory_id FROM memory_tags mt
+                JOIN tags t ON mt.tag_id = t.id
+                WHERE t.name IN ({placeholders})"""
+            params.extend(tag_names)
+            if match_all_tags:
+                tag_filter += """
+                GROUP BY mt.memory_id HAVING COUNT(DISTINCT mt.tag_id) = ?"""
+                params.append(len(tag_names))
+            conditions.append(tag_filter + ")")
+        
+        if memory_type:
+            conditions.append("m.memory_type = ?")
+            params.append(memory_type)
+            
+        if date_from:
+            conditions.append("m.created_at >= ?")
+            params.append(date_from)
+        
+        # Tag names are joined with the ASCII unit separator, char(31)
+        query = """SELECT m.id, m.content, m.memory_type, m.context, m.created_at,
+                          m.updated_at, m.access_count, m.last_accessed,
+                          (SELECT GROUP_CONCAT(t.name, char(31))
+                           FROM memory_tags mt JOIN tags t ON mt.tag_id = t.id
+                           WHERE mt.memory_id = m.id) AS tag_list
+                   FROM memories m"""
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY m.created_at DESC"
+        
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        
+        memories = await self.execute_query(query, tuple(params))
+        for memory in memories:
+            tag_list = memory.pop('tag_list')
+            memory['tags'] = tag_list.split('\x1f') if tag_list else []
+        return memories
+        
+    async def get_statistics_by_type(self) -> List[Dict[str, Any]]:
+        """Aggregate counts, access and content-length figures per memory type."""
+        query = """
+            SELECT memory_type,
+                   COUNT(*) AS count,
+                   SUM(access_count) AS access_sum,
+                   MIN(access_count) AS access_min,
+                   MAX(access_count) AS access_max,
+                   SUM(LENGTH(content)) AS length_sum,
+                   MIN(LENGTH(content)) AS length_min,
+                   MAX(LENGTH(content)) AS length_max,
+                   MIN(created_at) AS oldest,
+                   MAX(created_at) AS newest,
+                   SUM(EXISTS (
+                       SELECT 1 FROM memory_tags mt WHERE mt.memory_id = m.id
+                   )) AS with_tags
+            FROM memories m
+            GROUP BY memory_type
+        """
+        return await self.execute_query(query)
+        
     async def get_memory_count(self, memory_type: Optional[str] = None) -> int:
         """Get total count of memories, optionally filtered by type."""
         if memory_type:
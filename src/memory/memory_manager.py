@@ -2,9 +2,14 @@
 Memory Manager for handling AI context memory operations.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
+from collections import OrderedDict
+from dataclasses import replace
+from operator import itemgetter
 from datetime import datetime, timedelta
+import asyncio
 import logging
+import time
 
 try:
     from .database import DatabaseManager
@@ -16,31 +21,107 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Seconds a computed statistics snapshot stays valid
+STATS_CACHE_TTL = 1.0
+
+# Number of memories kept in the get_memory_by_id LRU cache
+MEMORY_CACHE_SIZE = 512
+
+# Number of distinct retrieve_memories queries kept in the LRU cache
+RETRIEVE_CACHE_SIZE = 256
+
+# Cached get_memory_by_id hits buffered before their access counts are written
+ACCESS_FLUSH_THRESHOLD = 32
+
+# Enum members and their string values mapped to the stored string value
+_MEMORY_TYPE_VALUES = {m: m.value for m in MemoryType}
+_MEMORY_TYPE_VALUES.update({m.value: m.value for m in MemoryType})
+# Stored string values mapped back to their enum members
+_MEMORY_TYPE_BY_STR = {m.value: m for m in MemoryType}
+
 class MemoryManager:
     """Core memory management class."""
     
-    def __init__(self, db_path: str = None):
-        self.db_manager = DatabaseManager(db_path)
+    def __init__(self, db_path: str = None, uri: bool = False):
+        # uri=True lets db_path be a "file:" URI, e.g. a shared-cache
+        # in-memory database that several managers can open
+        self.db_manager = DatabaseManager(db_path, uri=uri)
+        self._stats_cache = (0.0, None)  # (monotonic timestamp, stats)
+        self._stats_lock = asyncio.Lock()
+        # SQLite allows one writer at a time; queue writers here instead of
+        # letting them collide on the database lock
+        self._write_lock = asyncio.Lock()
+        self._tag_names: Optional[Set[str]] = None  # All tag names, kept in step with writes
+        self._tag_cache = None  # Sorted tuple of _tag_names
+        self._memory_cache: "OrderedDict[int, Memory]" = OrderedDict()
+        # query key -> (_access_seq when fetched, memories)
+        self._retrieve_cache: "OrderedDict[tuple, Tuple[int, List[Memory]]]" = OrderedDict()
+        # memory id -> (_access_seq, access_count, last_accessed) of its latest
+        # known access, laid over retrieve results cached before it
+        self._access_updates: Dict[int, Tuple[int, int, Optional[datetime]]] = {}
+        self._access_seq = 0
+        self._write_version = 0  # Bumped on every write
+        # memory id -> (unwritten access count, last access time)
+        self._pending_access: Dict[int, Tuple[int, datetime]] = {}
+        self._pending_hits = 0
+        # store_memory calls waiting to be written together: (future, record)
+        self._pending_stores: List[Tuple[asyncio.Future, tuple]] = []
+        self._store_flush_task: Optional[asyncio.Task] = None
         
     async def initialize(self):
         """Initialize the memory manager and database."""
         await self.db_manager.initialize()
+        tag_dicts = await self.db_manager.get_all_tags()
+        self._tag_names = set(map(itemgetter('name'), tag_dicts))
         
     async def close(self):
         """Close the memory manager and database connections."""
+        if self._store_flush_task is not None:
+            await self._store_flush_task
+        await self._flush_access_counts()
         await self.db_manager.close()
         
+    def _invalidate_caches(self):
+        """Drop cached read results after a write."""
+        self._stats_cache = (0.0, None)
+        self._retrieve_cache.clear()
+        self._access_updates.clear()
+        self._write_version += 1
+        
+    def _note_access(self, memory: Memory):
+        """Record a memory's current access count for cached retrieve results."""
+        self._access_seq += 1
+        self._access_updates[memory.id] = (
+            self._access_seq, memory.access_count, memory.last_accessed
+        )
+        
+    def _with_access_updates(self, memory: Memory, fetched_seq: int) -> Memory:
+        """Copy a cached retrieve result with accesses recorded since it was fetched."""
+        update = self._access_updates.get(memory.id)
+        if update is None or update[0] <= fetched_seq:
+            return self._copy_memory(memory)
+        _, access_count, last_accessed = update
+        return replace(
+            memory, tags=list(memory.tags),
+            access_count=access_count, last_accessed=last_accessed
+        )
+        
+    def _note_tags(self, tags: Optional[List[str]]):
+        """Record tag names a write may have created."""
+        if not tags or self._tag_names is None:
+            return
+        new_tags = set(tags) - self._tag_names
+        if new_tags:
+            self._tag_names |= new_tags
+            self._tag_cache = None
+        
     def _validate_memory_type(self, memory_type: MemoryType) -> str:
         """Validate and convert MemoryType enum to string."""
-        if isinstance(memory_type, MemoryType):
-            return memory_type.value
-        elif isinstance(memory_type, str):
-            # Validate that the string is a valid memory type
-            try:
-                MemoryType(memory_type)
-                return memory_type
-            except ValueError:
+        if isinstance(memory_type, (MemoryType, str)):
+            value = _MEMORY_TYPE_VALUES.get(memory_type)
+            if value is None:
                 raise ValueError(f"Invalid memory type: {memory_type}")
+            return value
         else:
             raise ValueError(f"Memory type must be MemoryType enum or string, got {type(memory_type)}")
     
@@ -78,28 +159,43 @@ class MemoryManager:
         
         return cleaned_tags if cleaned_tags else None
     
+    def _validate_context(self, context: Optional[str]) -> Optional[str]:
+        """Validate and clean context."""
+        if context is None:
+            return None
+        
+        context = context.strip()
+        if len(context) > 1000:  # 1KB limit for context
+            raise ValueError("Context too long (max 1000 characters)")
+            
+        return context or None
+    
+    @staticmethod
+    def _parse_datetime(dt_str):
+        """Parse datetime string from database."""
+        if not dt_str:
+            return None
+        try:
+            # Handle SQLite datetime format
+            if isinstance(dt_str, str):
+                # SQLite CURRENT_TIMESTAMP format: YYYY-MM-DD HH:MM:SS
+                if ' ' in dt_str and len(dt_str) == 19:
+                    return datetime.strptime(dt_str, '%Y-%m-%d %H:%M:%S')
+                else:
+                    return datetime.fromisoformat(dt_str)
+            return dt_str
+        except (ValueError, TypeError):
+            return None
+    
     def _dict_to_memory(self, memory_dict: Dict[str, Any]) -> Memory:
         """Convert database dictionary to Memory object."""
-        def parse_datetime(dt_str):
-            """Parse datetime string from database."""
-            if not dt_str:
-                return None
-            try:
-                # Handle SQLite datetime format
-                if isinstance(dt_str, str):
-                    # SQLite CURRENT_TIMESTAMP format: YYYY-MM-DD HH:MM:SS
-                    if ' ' in dt_str and len(dt_str) == 19:
-                        return datetime.strptime(dt_str, '%Y-%m-%d %H:%M:%S')
-                    else:
-                        return datetime.fromisoformat(dt_str)
-                return dt_str
-            except (ValueError, TypeError):
-                return None
+        parse_datetime = self._parse_datetime
         
         return Memory(
             id=memory_dict['id'],
             content=memory_dict['content'],
-            memory_type=MemoryType(memory_dict['memory_type']),
+            memory_type=_MEMORY_TYPE_BY_STR.get(memory_dict['memory_type'])
+                        or MemoryType(memory_dict['memory_type']),
             context=memory_dict.get('context'),
             tags=memory_dict.get('tags', []),
             created_at=parse_datetime(memory_dict.get('created_at')),
@@ -122,27 +218,88 @@ class MemoryManager:
             memory_type_str = self._validate_memory_type(memory_type)
             tags = self._validate_tags(tags)
             
-            # Validate context
-            if context is not None:
-                context = context.strip()
-                if len(context) > 1000:  # 1KB limit for context
-                    raise ValueError("Context too long (max 1000 characters)")
-                if not context:
-                    context = None
-            
-            # Store in database
-            memory_id = await self.db_manager.create_memory(
-                content=content,
-                memory_type=memory_type_str,
-                context=context,
-                tags=tags
+            context = self._validate_context(context)
+            
+            # Store in database, batched with any other stores made this tick
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending_stores.append(
+                (future, (content, memory_type_str, context, tags))
             )
+            if len(self._pending_stores) == 1:
+                self._store_flush_task = loop.create_task(self._flush_stores())
+            memory_id = await future
             
-            logger.info(f"Stored memory {memory_id} of type {memory_type_str}")
+            logger.info("Stored memory %s of type %s", memory_id, memory_type_str)
             return memory_id
             
         except Exception as e:
-            logger.error(f"Failed to store memory: {e}")
+            logger.error("Failed to store memory: %s", e)
+            raise
+            
+    async def _flush_stores(self):
+        """Write all queued store_memory records in one transaction."""
+        async with self._write_lock:
+            batch, self._pending_stores = self._pending_stores, []
+            if not batch:
+                return
+            records = [record for _, record in batch]
+            try:
+                if len(records) == 1:
+                    results = [await self.db_manager.create_memory(*records[0])]
+                else:
+                    results = await self.db_manager.create_memories_bulk(records)
+            except Exception as e:
+                if len(records) == 1:
+                    results = [e]
+                else:
+                    # Retry one by one so a bad record fails only its own caller
+                    results = []
+                    for record in records:
+                        try:
+                            results.append(await self.db_manager.create_memory(*record))
+                        except Exception as record_error:
+                            results.append(record_error)
+            
+            self._invalidate_caches()
+            for (future, (*_, tags)), result in zip(batch, results):
+                failed = isinstance(result, Exception)
+                if not failed:
+                    self._note_tags(tags)
+                if future.done():
+                    continue  # Caller was cancelled
+                if failed:
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+            
+    async def store_memories_bulk(
+        self,
+        memories: List[Tuple[str, MemoryType, Optional[List[str]], Optional[str]]]
+    ) -> List[int]:
+        """Store many (content, memory_type, tags, context) memories in one transaction."""
+        try:
+            records = [
+                (
+                    self._validate_content(content),
+                    self._validate_memory_type(memory_type),
+                    self._validate_context(context),
+                    self._validate_tags(tags)
+                )
+                for content, memory_type, tags, context in memories
+            ]
+            
+            async with self._write_lock:
+                memory_ids = await self.db_manager.create_memories_bulk(records)
+                self._invalidate_caches()
+                for *_, tags in records:
+                    self._note_tags(tags)
+            
+            logger.info("Stored %s memories", len(memory_ids))
+            return memory_ids
+            
+        except Exception as e:
+            logger.error("Failed to store memories: %s", e)
             raise
             
     async def retrieve_memories(
@@ -165,7 +322,18 @@ class MemoryManager:
             if limit is not None and limit <= 0:
                 raise ValueError("Limit must be positive")
             
+            cache_key = (query, memory_type_str, limit)
+            cached = self._retrieve_cache.get(cache_key)
+            if cached is not None:
+                self._retrieve_cache.move_to_end(cache_key)
+                fetched_seq, memories = cached
+                logger.info("Retrieved %s cached memories for query: %s", len(memories), query)
+                return [self._with_access_updates(memory, fetched_seq) for memory in memories]
+            
             # Search in database
+            await self._flush_access_counts()
+            version = self._write_version
+            fetched_seq = self._access_seq
             memory_dicts = await self.db_manager.search_memories(
                 query=query,
                 memory_type=memory_type_str,
@@ -175,11 +343,16 @@ class MemoryManager:
             # Convert to Memory objects
             memories = [self._dict_to_memory(mem_dict) for mem_dict in memory_dicts]
             
-            logger.info(f"Retrieved {len(memories)} memories for query: {query}")
-            return memories
+            if version == self._write_version:
+                self._retrieve_cache[cache_key] = (fetched_seq, memories)
+                if len(self._retrieve_cache) > RETRIEVE_CACHE_SIZE:
+                    self._retrieve_cache.popitem(last=False)
+            
+            logger.info("Retrieved %s memories for query: %s", len(memories), query)
+            return [self._copy_memory(memory) for memory in memories]
             
         except Exception as e:
-            logger.error(f"Failed to retrieve memories: {e}")
+            logger.error("Failed to retrieve memories: %s", e)
             raise
             
     async def get_memory_by_id(self, memory_id: int) -> Optional[Memory]:
@@ -188,16 +361,65 @@ class MemoryManager:
             if memory_id <= 0:
                 raise ValueError("Memory ID must be positive")
             
+            cached = self._memory_cache.get(memory_id)
+            if cached is not None:
+                # Skip the database entirely; the access is written lazily
+                cached.access_count += 1
+                cached.last_accessed = datetime.utcnow().replace(microsecond=0)
+                self._memory_cache.move_to_end(memory_id)
+                count, _ = self._pending_access.get(memory_id, (0, None))
+                self._pending_access[memory_id] = (count + 1, cached.last_accessed)
+                self._pending_hits += 1
+                self._note_access(cached)
+                result = self._copy_memory(cached)
+                if self._pending_hits >= ACCESS_FLUSH_THRESHOLD:
+                    await self._flush_access_counts()
+                return result
+            
+            await self._flush_access_counts()
+            version = self._write_version
             memory_dict = await self.db_manager.get_memory(memory_id)
             if not memory_dict:
                 return None
-                
-            return self._dict_to_memory(memory_dict)
+            
+            memory = self._dict_to_memory(memory_dict)
+            if version == self._write_version:
+                self._memory_cache[memory_id] = memory
+                if len(self._memory_cache) > MEMORY_CACHE_SIZE:
+                    self._memory_cache.popitem(last=False)
+            # get_memory bumped the access count in the database
+            self._note_access(memory)
+            return self._copy_memory(memory)
             
         except Exception as e:
-            logger.error(f"Failed to get memory {memory_id}: {e}")
+            logger.error("Failed to get memory %s: %s", memory_id, e)
             raise
             
+    @staticmethod
+    def _copy_memory(memory: Memory) -> Memory:
+        """Copy a cached memory so callers can modify the result freely."""
+        return replace(memory, tags=list(memory.tags))
+    
+    async def _record_access(self, memory_id: int) -> bool:
+        """Bump a memory's access count and last access time."""
+        return await self.db_manager.update_memory_access(memory_id)
+    
+    async def _flush_access_counts(self):
+        """Write access counts buffered by cached get_memory_by_id hits.
+        
+        Called before reads that return access counts from the database,
+        so they never see stale values.
+        """
+        if not self._pending_access:
+            return
+        async with self._write_lock:
+            pending, self._pending_access = self._pending_access, {}
+            self._pending_hits = 0
+            await self.db_manager.add_memory_accesses([
+                (count, last_accessed.strftime('%Y-%m-%d %H:%M:%S'), memory_id)
+                for memory_id, (count, last_accessed) in pending.items()
+            ])
+            
     async def update_memory(
         self, 
         memory_id: int, 
@@ -215,32 +437,33 @@ class MemoryManager:
                 content = self._validate_content(content)
             
             if context is not None:
-                context = context.strip()
-                if len(context) > 1000:
-                    raise ValueError("Context too long (max 1000 characters)")
-                if not context:
-                    context = None
+                context = self._validate_context(context)
             
             if tags is not None:
                 tags = self._validate_tags(tags)
             
             # Update in database
-            success = await self.db_manager.update_memory(
-                memory_id=memory_id,
-                content=content,
-                context=context,
-                tags=tags
-            )
+            async with self._write_lock:
+                success = await self.db_manager.update_memory(
+                    memory_id=memory_id,
+                    content=content,
+                    context=context,
+                    tags=tags
+                )
+                if success:
+                    self._invalidate_caches()
+                    self._note_tags(tags)
+                    self._memory_cache.pop(memory_id, None)
             
             if success:
-                logger.info(f"Updated memory {memory_id}")
+                logger.info("Updated memory %s", memory_id)
             else:
-                logger.warning(f"Memory {memory_id} not found for update")
+                logger.warning("Memory %s not found for update", memory_id)
                 
             return success
             
         except Exception as e:
-            logger.error(f"Failed to update memory {memory_id}: {e}")
+            logger.error("Failed to update memory %s: %s", memory_id, e)
             raise
             
     async def delete_memory(self, memory_id: int) -> bool:
@@ -249,17 +472,22 @@ class MemoryManager:
             if memory_id <= 0:
                 raise ValueError("Memory ID must be positive")
             
-            success = await self.db_manager.delete_memory(memory_id)
+            async with self._write_lock:
+                success = await self.db_manager.delete_memory(memory_id)
+                if success:
+                    self._invalidate_caches()
+                    self._memory_cache.pop(memory_id, None)
+                    self._pending_access.pop(memory_id, None)
             
             if success:
-                logger.info(f"Deleted memory {memory_id}")
+                logger.info("Deleted memory %s", memory_id)
             else:
-                logger.warning(f"Memory {memory_id} not found for deletion")
+                logger.warning("Memory %s not found for deletion", memory_id)
                 
             return success
             
         except Exception as e:
-            logger.error(f"Failed to delete memory {memory_id}: {e}")
+            logger.error("Failed to delete memory %s: %s", memory_id, e)
             raise
             
     async def list_memories(
@@ -275,13 +503,10 @@ class MemoryManager:
             if memory_type:
                 memory_type_str = self._validate_memory_type(memory_type)
             
-            if limit is not None and limit <= 0:
-                raise ValueError("Limit must be positive")
-                
-            if offset is not None and offset < 0:
-                raise ValueError("Offset must be non-negative")
+            self._validate_pagination(limit, offset)
             
             # Get from database
+            await self._flush_access_counts()
             memory_dicts = await self.db_manager.list_memories(
                 memory_type=memory_type_str,
                 limit=limit,
@@ -291,11 +516,11 @@ class MemoryManager:
             # Convert to Memory objects
             memories = [self._dict_to_memory(mem_dict) for mem_dict in memory_dicts]
             
-            logger.info(f"Listed {len(memories)} memories")
+            logger.info("Listed %s memories", len(memories))
             return memories
             
         except Exception as e:
-            logger.error(f"Failed to list memories: {e}")
+            logger.error("Failed to list memories: %s", e)
             raise
             
     async def clear_memories(self, memory_type: Optional[MemoryType] = None) -> int:
@@ -305,53 +530,123 @@ class MemoryManager:
             if memory_type:
                 memory_type_str = self._validate_memory_type(memory_type)
             
-            cleared_count = await self.db_manager.clear_memories(memory_type_str)
+            async with self._write_lock:
+                cleared_count = await self.db_manager.clear_memories(memory_type_str)
+                self._invalidate_caches()
+                self._memory_cache.clear()
+                if memory_type_str is None:
+                    self._pending_access.clear()
             
             if memory_type_str:
-                logger.info(f"Cleared {cleared_count} memories of type {memory_type_str}")
+                logger.info("Cleared %s memories of type %s", cleared_count, memory_type_str)
             else:
-                logger.info(f"Cleared all {cleared_count} memories")
+                logger.info("Cleared all %s memories", cleared_count)
                 
             return cleared_count
             
         except Exception as e:
-            logger.error(f"Failed to clear memories: {e}")
+            logger.error("Failed to clear memories: %s", e)
             raise
             
-    async def get_memory_count(self, memory_type: Optional[MemoryType] = None) -> int:
-        """Get count of memories, optionally filtered by type."""
+    async def _truncate_all(self):
+        """Empty the database and every cache, keeping the schema and connection.
+        
+        Cheaper than closing and re-initializing a manager when the same
+        instance is reused against a clean slate.
+        """
+        if self._store_flush_task is not None:
+            await self._store_flush_task
+        async with self._write_lock:
+            await self.db_manager.truncate_all()
+            self._invalidate_caches()
+            self._memory_cache.clear()
+            self._pending_access.clear()
+            self._pending_hits = 0
+            self._tag_names = set()
+            self._tag_cache = None
+            
+    @staticmethod
+    def _validate_pagination(limit: Optional[int], offset: Optional[int]):
+        """Validate list_memories style limit/offset values."""
+        if limit is not None and limit <= 0:
+            raise ValueError("Limit must be positive")
+            
+        if offset is not None and offset < 0:
+            raise ValueError("Offset must be non-negative")
+            
+    async def get_memory_count(
+        self,
+        memory_type: Optional[MemoryType] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None
+    ) -> int:
+        """Get count of memories, optionally filtered by type.
+        
+        With limit/offset, returns how many rows list_memories would
+        return for the same arguments.
+        """
         try:
             memory_type_str = None
             if memory_type:
                 memory_type_str = self._validate_memory_type(memory_type)
+            self._validate_pagination(limit, offset)
             
             count = await self.db_manager.get_memory_count(memory_type_str)
+            count = max(count - (offset or 0), 0)
+            if limit is not None:
+                count = min(count, limit)
             return count
             
         except Exception as e:
-            logger.error(f"Failed to get memory count: {e}")
+            logger.error("Failed to get memory count: %s", e)
             raise
             
     async def get_all_tags(self) -> List[str]:
         """Get all available tags."""
+        return list(await self.get_all_tags_sorted())
+    
+    async def get_all_tags_sorted(self) -> Tuple[str, ...]:
+        """Get all tag names as a sorted tuple.
+        
+        Served from the in-memory tag set, which writes keep up to date; the
+        database is only read after cleanup_unused_tags() removed tags.
+        """
+        tags = self._tag_cache
+        if tags is not None:
+            return tags
+        
         try:
-            tag_dicts = await self.db_manager.get_all_tags()
-            tags = [tag_dict['name'] for tag_dict in tag_dicts]
+            if self._tag_names is None:
+                version = self._write_version
+                tag_dicts = await self.db_manager.get_all_tags()
+                tag_names = set(map(itemgetter('name'), tag_dicts))
+                # Don't keep a result that a concurrent write has made stale
+                if version != self._write_version:
+                    return tuple(sorted(tag_names))
+                self._tag_names = tag_names
+            tags = tuple(sorted(self._tag_names))
+            self._tag_cache = tags
             return tags
             
         except Exception as e:
-            logger.error(f"Failed to get all tags: {e}")
+            logger.error("Failed to get all tags: %s", e)
             raise
             
     async def cleanup_unused_tags(self) -> int:
         """Remove tags that are not associated with any memories."""
         try:
-            deleted_count = await self.db_manager.delete_unused_tags()
-            logger.info(f"Cleaned up {deleted_count} unused tags")
+            async with self._write_lock:
+                deleted_count = await self.db_manager.delete_unused_tags()
+                self._invalidate_caches()
+                if deleted_count:
+                    # Reloaded on the next get_all_tags()
+                    self._tag_names = None
+                    self._tag_cache = None
+            logger.info("Cleaned up %s unused tags", deleted_count)
             return deleted_count
             
         except Exception as e:
-            logger.error(f"Failed to cleanup unused tags: {e}")
+            logger.error("Failed to cleanup unused tags: %s", e)
             raise
             
     # Advanced search and management functions
@@ -397,6 +692,7 @@ class MemoryManager:
                 content_search = " ".join(keywords)
             
             # Use database advanced search
+            await self._flush_access_counts()
             memory_dicts = await self.db_manager.search_memories_with_filters(
                 content_search=content_search,
                 memory_type=memory_type_str,
@@ -410,11 +706,61 @@ class MemoryManager:
             # Convert to Memory objects
             memories = [self._dict_to_memory(mem_dict) for mem_dict in memory_dicts]
             
-            logger.info(f"Advanced search returned {len(memories)} memories")
+            logger.info("Advanced search returned %s memories", len(memories))
             return memories
             
         except Exception as e:
-            logger.error(f"Failed to search memories: {e}")
+            logger.error("Failed to search memories: %s", e)
+            raise
+            
+    async def unified_search(
+        self,
+        keywords: Optional[List[str]] = None,
+        tags: Optional[List[str]] = None,
+        memory_type: Optional[MemoryType] = None,
+        match_all_tags: bool = False,
+        date_from: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List[Memory]:
+        """Search by any combination of keywords, tags, type and date.
+        
+        Keywords use OR logic; tags use AND logic when match_all_tags is set
+        and OR logic otherwise. All filters run as one database query.
+        """
+        try:
+            if keywords:
+                keywords = [kw.strip() for kw in keywords if kw.strip()] or None
+            
+            if tags:
+                tags = self._validate_tags(tags)
+            
+            memory_type_str = None
+            if memory_type:
+                memory_type_str = self._validate_memory_type(memory_type)
+            
+            if limit is not None and limit <= 0:
+                raise ValueError("Limit must be positive")
+            
+            # Match the CURRENT_TIMESTAMP format used for created_at
+            date_from_str = date_from.isoformat(sep=" ") if date_from else None
+            
+            await self._flush_access_counts()
+            memory_dicts = await self.db_manager.search_memories_unified(
+                keywords=keywords,
+                tag_names=tags,
+                match_all_tags=match_all_tags,
+                memory_type=memory_type_str,
+                date_from=date_from_str,
+                limit=limit
+            )
+            
+            memories = [self._dict_to_memory(mem_dict) for mem_dict in memory_dicts]
+            
+            logger.info("Unified search returned %s memories", len(memories))
+            return memories
+            
+        except Exception as e:
+            logger.error("Failed to search memories: %s", e)
             raise
             
     async def search_memories_by_keywords(
@@ -441,57 +787,21 @@ class MemoryManager:
             if limit is not None and limit <= 0:
                 raise ValueError("Limit must be positive")
             
-            if match_all:
-                # AND logic: search for memories containing all keywords
-                memories = []
-                for keyword in keywords:
-                    keyword_memories = await self.db_manager.search_memories(
-                        query=keyword,
-                        memory_type=memory_type_str
-                    )
-                    
-                    if not memories:
-                        # First keyword - initialize with all matches
-                        memories = [self._dict_to_memory(mem) for mem in keyword_memories]
-                    else:
-                        # Subsequent keywords - keep only memories that match
-                        keyword_ids = {mem['id'] for mem in keyword_memories}
-                        memories = [mem for mem in memories if mem.id in keyword_ids]
-                
-                # Apply limit if specified
-                if limit:
-                    memories = memories[:limit]
-                    
-            else:
-                # OR logic: search for memories containing any keyword
-                all_memory_dicts = []
-                seen_ids = set()
-                
-                for keyword in keywords:
-                    keyword_memories = await self.db_manager.search_memories(
-                        query=keyword,
-                        memory_type=memory_type_str
-                    )
-                    
-                    for mem_dict in keyword_memories:
-                        if mem_dict['id'] not in seen_ids:
-                            all_memory_dicts.append(mem_dict)
-                            seen_ids.add(mem_dict['id'])
-                
-                # Sort by creation date (newest first)
-                all_memory_dicts.sort(key=lambda x: x['created_at'], reverse=True)
-                
-                # Apply limit if specified
-                if limit:
-                    all_memory_dicts = all_memory_dicts[:limit]
-                
-                memories = [self._dict_to_memory(mem_dict) for mem_dict in all_memory_dicts]
+            await self._flush_access_counts()
+            # AND/OR is resolved by the database in a single query
+            memory_dicts = await self.db_manager.search_memories_by_keywords(
+                keywords,
+                match_all=match_all,
+                memory_type=memory_type_str,
+                limit=limit
+            )
+            memories = [self._dict_to_memory(mem_dict) for mem_dict in memory_dicts]
             
-            logger.info(f"Keyword search ({'AND' if match_all else 'OR'}) returned {len(memories)} memories")
+            logger.info("Keyword search (%s) returned %s memories", 'AND' if match_all else 'OR', len(memories))
             return memories
             
         except Exception as e:
-            logger.error(f"Failed to search by keywords: {e}")
+            logger.error("Failed to search by keywords: %s", e)
             raise
             
     async def get_memories_by_tags(
@@ -518,26 +828,17 @@ class MemoryManager:
             if limit is not None and limit <= 0:
                 raise ValueError("Limit must be positive")
             
+            await self._flush_access_counts()
             if match_all:
-                # AND logic: memories must have all specified tags
-                # Get all memories first, then filter
-                all_memories = await self.db_manager.list_memories(
-                    memory_type=memory_type_str
+                # AND logic: memories must have all specified tags, resolved
+                # in SQL with GROUP BY ... HAVING over memory_tags
+                memory_dicts = await self.db_manager.search_memories_unified(
+                    tag_names=tags,
+                    match_all_tags=True,
+                    memory_type=memory_type_str,
+                    limit=limit
                 )
                 
-                # Filter to ensure ALL tags are present
-                filtered_memories = []
-                for mem_dict in all_memories:
-                    mem_tags = set(mem_dict.get('tags', []))
-                    if set(tags).issubset(mem_tags):
-                        filtered_memories.append(mem_dict)
-                
-                # Apply limit if specified
-                if limit:
-                    filtered_memories = filtered_memories[:limit]
-                
-                memory_dicts = filtered_memories
-                
             else:
                 # OR logic: memories with any of the specified tags
                 memory_dicts = await self.db_manager.get_memories_by_tag_names(tags)
@@ -555,11 +856,11 @@ class MemoryManager:
             
             memories = [self._dict_to_memory(mem_dict) for mem_dict in memory_dicts]
             
-            logger.info(f"Tag search ({'AND' if match_all else 'OR'}) returned {len(memories)} memories")
+            logger.info("Tag search (%s) returned %s memories", 'AND' if match_all else 'OR', len(memories))
             return memories
             
         except Exception as e:
-            logger.error(f"Failed to get memories by tags: {e}")
+            logger.error("Failed to get memories by tags: %s", e)
             raise
             
     async def get_recent_memories(
@@ -583,7 +884,7 @@ class MemoryManager:
             )
             
         except Exception as e:
-            logger.error(f"Failed to get recent memories: {e}")
+            logger.error("Failed to get recent memories: %s", e)
             raise
             
     async def get_frequently_accessed_memories(
@@ -623,56 +924,73 @@ class MemoryManager:
             if limit:
                 frequent_memories = frequent_memories[:limit]
             
-            logger.info(f"Found {len(frequent_memories)} frequently accessed memories")
+            logger.info("Found %s frequently accessed memories", len(frequent_memories))
             return frequent_memories
             
         except Exception as e:
-            logger.error(f"Failed to get frequently accessed memories: {e}")
+            logger.error("Failed to get frequently accessed memories: %s", e)
             raise
             
     async def get_memory_statistics(self) -> Dict[str, Any]:
-        """Get comprehensive statistics about stored memories."""
+        """Get comprehensive statistics about stored memories.
+        
+        Results are cached for STATS_CACHE_TTL seconds; concurrent callers
+        wait on the same lock so a burst of requests runs the queries once.
+        """
+        async with self._stats_lock:
+            cached_at, stats = self._stats_cache
+            if stats is None or time.monotonic() - cached_at >= STATS_CACHE_TTL:
+                stats = await self._collect_memory_statistics()
+                self._stats_cache = (time.monotonic(), stats)
+            return dict(stats)
+            
+    async def _collect_memory_statistics(self) -> Dict[str, Any]:
+        """Query the database for a fresh statistics snapshot."""
         try:
-            stats = {}
+            await self._flush_access_counts()
             
-            # Total counts by type
+            # One grouped query instead of a count per type plus a full listing
+            rows = await self.db_manager.get_statistics_by_type()
+            by_type = {row['memory_type']: row for row in rows}
+            
+            stats = {}
             for memory_type in MemoryType:
-                count = await self.get_memory_count(memory_type)
-                stats[f"{memory_type.value}_count"] = count
+                row = by_type.get(memory_type.value)
+                stats[f"{memory_type.value}_count"] = row['count'] if row else 0
             
-            # Total count
-            stats['total_count'] = await self.get_memory_count()
+            total = sum(row['count'] for row in rows)
+            stats['total_count'] = total
             
             # Tag statistics
-            all_tags = await self.get_all_tags()
+            all_tags = await self.get_all_tags_sorted()
             stats['total_tags'] = len(all_tags)
             
-            # Get all memories for additional statistics
-            all_memories = await self.list_memories()
-            
-            if all_memories:
+            if total:
                 # Access count statistics
-                access_counts = [mem.access_count for mem in all_memories]
-                stats['avg_access_count'] = sum(access_counts) / len(access_counts)
-                stats['max_access_count'] = max(access_counts)
-                stats['min_access_count'] = min(access_counts)
+                stats['avg_access_count'] = sum(row['access_sum'] for row in rows) / total
+                stats['max_access_count'] = max(row['access_max'] for row in rows)
+                stats['min_access_count'] = min(row['access_min'] for row in rows)
                 
                 # Date statistics
-                created_dates = [mem.created_at for mem in all_memories if mem.created_at]
-                if created_dates:
-                    stats['oldest_memory'] = min(created_dates).isoformat()
-                    stats['newest_memory'] = max(created_dates).isoformat()
+                oldest = self._parse_datetime(min(
+                    (row['oldest'] for row in rows if row['oldest']), default=None
+                ))
+                newest = self._parse_datetime(max(
+                    (row['newest'] for row in rows if row['newest']), default=None
+                ))
+                if oldest and newest:
+                    stats['oldest_memory'] = oldest.isoformat()
+                    stats['newest_memory'] = newest.isoformat()
                 
                 # Content length statistics
-                content_lengths = [len(mem.content) for mem in all_memories]
-                stats['avg_content_length'] = sum(content_lengths) / len(content_lengths)
-                stats['max_content_length'] = max(content_lengths)
-                stats['min_content_length'] = min(content_lengths)
+                stats['avg_content_length'] = sum(row['length_sum'] for row in rows) / total
+                stats['max_content_length'] = max(row['length_max'] for row in rows)
+                stats['min_content_length'] = min(row['length_min'] for row in rows)
                 
                 # Memories with tags vs without tags
-                with_tags = sum(1 for mem in all_memories if mem.tags)
+                with_tags = sum(row['with_tags'] for row in rows)
                 stats['memories_with_tags'] = with_tags
-                stats['memories_without_tags'] = len(all_memories) - with_tags
+                stats['memories_without_tags'] = total - with_tags
                 
             else:
                 # No memories exist
@@ -691,7 +1009,7 @@ class MemoryManager:
             return stats
             
         except Exception as e:
-            logger.error(f"Failed to get memory statistics: {e}")
+            logger.error("Failed to get memory statistics: %s", e)
             raise
             
     async def update_memory_access_count(self, memory_id: int) -> bool:
@@ -700,17 +1018,15 @@ class MemoryManager:
             if memory_id <= 0:
                 raise ValueError("Memory ID must be positive")
             
-            # Use database manager's update method
-            success = await self.db_manager.execute_update(
-                """UPDATE memories 
-                   SET access_count = access_count + 1, 
-                       last_accessed = CURRENT_TIMESTAMP 
-                   WHERE id = ?""",
-                (memory_id,)
-            )
-            
-            return success > 0
+            # The cached copy no longer reflects the access count
+            self._memory_cache.pop(memory_id, None)
+            await self._flush_access_counts()
+            updated = await self._record_access(memory_id)
+            if updated:
+                # The new count is only known to the database
+                self._invalidate_caches()
+            return updated
             
         except Exception as e:
-            logger.error(f"Failed to update access count for memory {memory_id}: {e}")
+            logger.error("Failed to update access count for memory %s: %s", memory_id, e)
             raise
\ No newline at end of file
@@ -5,6 +5,7 @@ Data models and types for AI Context Memory.
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
 from typing import List, Optional
 
 class MemoryType(Enum):
@@ -30,6 +31,21 @@ class Memory:
     def __post_init__(self):
         if self.tags is None:
             self.tags = []
+    
+    @cached_property
+    def created_at_iso(self) -> Optional[str]:
+        """ISO 8601 form of created_at, computed once per object."""
+        return self.created_at.isoformat() if self.created_at else None
+    
+    @cached_property
+    def updated_at_iso(self) -> Optional[str]:
+        """ISO 8601 form of updated_at, computed once per object."""
+        return self.updated_at.isoformat() if self.updated_at else None
+    
+    @cached_property
+    def last_accessed_iso(self) -> Optional[str]:
+        """ISO 8601 form of last_accessed, computed once per object."""
+        return self.last_accessed.isoformat() if self.last_accessed else None
 
 @dataclass
 class Tag:
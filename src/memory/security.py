@@ -5,15 +5,49 @@ Security and privacy utilities for AI Context Memory.
 import os
 import base64
 import hashlib
+import re
 import secrets
 from typing import Optional, Dict, Any, List
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Prefix marking AES-GCM ciphertexts; anything else is a legacy Fernet token.
+# ':' is outside the urlsafe base64 alphabet, so the two never collide.
+_AESGCM_PREFIX = 'v2:'
+_AESGCM_NONCE_SIZE = 12
+
+# Email addresses are masked first: the local part may swallow digits that
+# the number patterns below would otherwise claim
+_EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+# Number patterns, combined so the text is scanned once. Alternatives are
+# tried in this order at each position; group names map to their mask.
+_PII_PATTERNS = (
+    # Phone numbers (basic patterns)
+    ('PHONE', r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'),
+    ('PHONE_PAREN', r'\b\(\d{3}\)\s*\d{3}[-.]?\d{4}\b'),
+    # Credit card numbers (basic pattern)
+    ('CARD', r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b'),
+    # SSN (US format)
+    ('SSN', r'\b\d{3}-\d{2}-\d{4}\b'),
+)
+_PII_PATTERN = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in _PII_PATTERNS))
+_PII_MASKS = {
+    'PHONE': '[PHONE]',
+    'PHONE_PAREN': '[PHONE]',
+    'CARD': '[CARD]',
+    'SSN': '[SSN]',
+}
+
+def _mask_pii(match) -> str:
+    """Replacement callback for _PII_PATTERN."""
+    return _PII_MASKS[match.lastgroup]
+
 class EncryptionManager:
     """Manages encryption and decryption of sensitive data."""
     
@@ -26,6 +60,7 @@ class EncryptionManager:
         """
         self.enabled = password is not None
         self._fernet = None
+        self._aead = None
         self._salt = salt
         
         if self.enabled:
@@ -47,15 +82,17 @@ class EncryptionManager:
                 salt=self._salt,
                 iterations=100000,
             )
-            key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
+            key = kdf.derive(password.encode())
             
-            # Initialize Fernet cipher
-            self._fernet = Fernet(key)
+            # The key is derived once here; encrypt/decrypt only run the cipher.
+            # AES-GCM is used for new data, Fernet only to read older values.
+            self._aead = AESGCM(key)
+            self._fernet = Fernet(base64.urlsafe_b64encode(key))
             
             logger.info("Encryption initialized successfully")
             
         except Exception as e:
-            logger.error(f"Failed to initialize encryption: {e}")
+            logger.error("Failed to initialize encryption: %s", e)
             raise
     
     def get_salt(self) -> Optional[bytes]:
@@ -75,10 +112,11 @@ class EncryptionManager:
             return data
         
         try:
-            encrypted_bytes = self._fernet.encrypt(data.encode('utf-8'))
-            return base64.urlsafe_b64encode(encrypted_bytes).decode('utf-8')
+            nonce = os.urandom(_AESGCM_NONCE_SIZE)
+            encrypted_bytes = nonce + self._aead.encrypt(nonce, data.encode('utf-8'), None)
+            return _AESGCM_PREFIX + base64.urlsafe_b64encode(encrypted_bytes).decode('utf-8')
         except Exception as e:
-            logger.error(f"Encryption failed: {e}")
+            logger.error("Encryption failed: %s", e)
             raise
     
     def decrypt(self, encrypted_data: str) -> str:
@@ -94,11 +132,20 @@ class EncryptionManager:
             return encrypted_data
         
         try:
-            encrypted_bytes = base64.urlsafe_b64decode(encrypted_data.encode('utf-8'))
-            decrypted_bytes = self._fernet.decrypt(encrypted_bytes)
+            if encrypted_data.startswith(_AESGCM_PREFIX):
+                encrypted_bytes = base64.urlsafe_b64decode(
+                    encrypted_data[len(_AESGCM_PREFIX):].encode('utf-8')
+                )
+                nonce = encrypted_bytes[:_AESGCM_NONCE_SIZE]
+                decrypted_bytes = self._aead.decrypt(
+                    nonce, encrypted_bytes[_AESGCM_NONCE_SIZE:], None
+                )
+            else:
+                encrypted_bytes = base64.urlsafe_b64decode(encrypted_data.encode('utf-8'))
+                decrypted_bytes = self._fernet.decrypt(encrypted_bytes)
             return decrypted_bytes.decode('utf-8')
         except Exception as e:
-            logger.error(f"Decryption failed: {e}")
+            logger.error("Decryption failed: %s", e)
             raise
     
     def encrypt_dict(self, data: Dict[str, Any], fields_to_encrypt: List[str]) -> Dict[str, Any]:
@@ -156,7 +203,7 @@ class EncryptionManager:
                             for item in decrypted_data[field]
                         ]
                 except Exception as e:
-                    logger.warning(f"Failed to decrypt field '{field}': {e}")
+                    logger.warning("Failed to decrypt field '%s': %s", field, e)
                     # Keep original value if decryption fails
         
         return decrypted_data
@@ -180,7 +227,7 @@ class PrivacyManager:
             keywords: List of keywords to block
         """
         self.blocked_keywords = {kw.lower().strip() for kw in keywords if kw.strip()}
-        logger.info(f"Set {len(self.blocked_keywords)} blocked keywords")
+        logger.info("Set %s blocked keywords", len(self.blocked_keywords))
     
     def add_blocked_keyword(self, keyword: str):
         """Add a keyword to the blocked list.
@@ -190,7 +237,7 @@ class PrivacyManager:
         """
         if keyword.strip():
             self.blocked_keywords.add(keyword.lower().strip())
-            logger.info(f"Added blocked keyword: {keyword}")
+            logger.info("Added blocked keyword: %s", keyword)
     
     def remove_blocked_keyword(self, keyword: str):
         """Remove a keyword from the blocked list.
@@ -201,7 +248,7 @@ class PrivacyManager:
         keyword_lower = keyword.lower().strip()
         if keyword_lower in self.blocked_keywords:
             self.blocked_keywords.remove(keyword_lower)
-            logger.info(f"Removed blocked keyword: {keyword}")
+            logger.info("Removed blocked keyword: %s", keyword)
     
     def set_retention_period(self, days: Optional[int]):
         """Set data retention period.
@@ -211,7 +258,7 @@ class PrivacyManager:
         """
         self.retention_days = days
         if days:
-            logger.info(f"Set data retention period to {days} days")
+            logger.info("Set data retention period to %s days", days)
         else:
             logger.info("Disabled data retention limit")
     
@@ -289,24 +336,9 @@ class PrivacyManager:
         if not content:
             return content
         
-        # Basic sanitization - remove common PII patterns
-        import re
-        
-        # Mask email addresses
-        content = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', 
-                        '[EMAIL]', content)
-        
-        # Mask phone numbers (basic patterns)
-        content = re.sub(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', '[PHONE]', content)
-        content = re.sub(r'\b\(\d{3}\)\s*\d{3}[-.]?\d{4}\b', '[PHONE]', content)
-        
-        # Mask credit card numbers (basic pattern)
-        content = re.sub(r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b', '[CARD]', content)
-        
-        # Mask SSN (US format)
-        content = re.sub(r'\b\d{3}-\d{2}-\d{4}\b', '[SSN]', content)
-        
-        return content
+        # Basic sanitization - mask common PII patterns
+        content = _EMAIL_PATTERN.sub('[EMAIL]', content)
+        return _PII_PATTERN.sub(_mask_pii, content)
     
     def should_encrypt_field(self, field_name: str) -> bool:
         """Check if a field should be encrypted.
@@ -436,7 +468,7 @@ class SecureMemoryManager:
                 expired_count += 1
         
         if expired_count > 0:
-            logger.info(f"Cleared {expired_count} expired memories")
+            logger.info("Cleared %s expired memories", expired_count)
         
         return expired_count
     
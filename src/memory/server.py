@@ -5,14 +5,28 @@ AI Context Memory MCP Server 主入口
 """
 
 import sys
-import os
 import asyncio
-import argparse
 import logging
-from pathlib import Path
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# 日志级别名称到数值的映射，同时作为 --log-level 的可选值
+LOG_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+# argparse、pathlib、logging.handlers 只在命令行启动时用到，
+# 放到函数内部导入，作为库被导入时不承担这部分开销
 
 def setup_paths():
     """设置Python路径"""
+    from pathlib import Path
+    
     current_dir = Path(__file__).parent
     project_root = current_dir.parent.parent.parent
     
@@ -23,13 +37,206 @@ def setup_paths():
     
     return project_root
 
-async def run_mcp_server():
-    """运行MCP服务器"""
+class CachedTimeFormatter(logging.Formatter):
+    """按秒缓存时间戳字符串的日志格式器
+
+    datefmt 精确到秒，同一秒内的记录直接复用上一次 strftime 的结果。
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (秒, 格式化结果) 作为整体替换，多线程下读到的总是一致的一对
+        self._time_cache = (None, "")
+    
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        cached_second, cached_time = self._time_cache
+        if second == cached_second:
+            return cached_time
+        formatted = super().formatTime(record, datefmt)
+        self._time_cache = (second, formatted)
+        return formatted
+
+# 日志格式器在模块加载时创建一次，所有 handler 共用；
+# 指定 datefmt 后 formatTime 不再额外拼接毫秒
+FORMATTER = CachedTimeFormatter(
+    '{asctime} - {name} - {levelname} - {message}',
+    datefmt='%Y-%m-%d %H:%M:%S',
+    style='{'
+)
+
+def setup_logging(log_level: str = "INFO", log_file: str = None):
+    """设置日志
+
+    文件日志经 MemoryHandler 缓冲，攒满一批或遇到 ERROR 时才一次性写盘，
+    避免每条记录都触发一次 write()。
+    """
+    import logging.handlers
+    
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(FORMATTER)
+    handlers = [stream_handler]
+    
+    if log_file:
+        # MemoryHandler 只负责缓冲，真正格式化记录的是它的 target
+        file_handler = logging.FileHandler(log_file, encoding="utf-8")
+        file_handler.setFormatter(FORMATTER)
+        handlers.append(logging.handlers.MemoryHandler(
+            capacity=512,
+            flushLevel=logging.ERROR,
+            target=file_handler
+        ))
+    
+    # 服务器在单进程的 asyncio 循环中运行，日志格式也不含进程/线程字段
+    logging.logProcesses = False
+    logging.logThreads = False
+    
+    logging.basicConfig(
+        level=LOG_LEVELS[log_level.upper()],
+        handlers=handlers
+    )
+
+def flush_logging():
+    """刷新所有日志缓冲区，确保退出前日志完整落盘"""
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+def tune_process(pin_cpu: int = None, nice: int = None):
+    """按需把进程绑定到指定CPU核心、调整调度优先级"""
+    import os
+    
+    if pin_cpu is not None:
+        if hasattr(os, "sched_setaffinity"):
+            try:
+                os.sched_setaffinity(0, {pin_cpu})
+            except OSError as e:
+                logger.warning("Failed to pin process to CPU %s: %s", pin_cpu, e)
+        else:
+            logger.warning("CPU pinning is not supported on this platform")
+    
+    if nice is not None:
+        if hasattr(os, "nice"):
+            try:
+                os.nice(nice)
+            except OSError as e:
+                logger.warning("Failed to adjust niceness by %s: %s", nice, e)
+        else:
+            logger.warning("Adjusting niceness is not supported on this platform")
+
+def install_uvloop():
+    """如果安装了uvloop，使用它替换默认事件循环"""
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    
+    uvloop.install()
+    return True
+
+# stdio 传输的读写缓冲区大小
+STDIO_BUFFER_SIZE = 1 << 16
+
+class StdinLineReader:
+    """在守护线程中逐行读取stdin的异步迭代器
+    
+    阻塞的readline无法被取消，放在守护线程里可以保证收到退出信号后
+    进程能立即结束，而不用等待客户端关闭管道。每次迭代只读取一行，
+    与anyio.wrap_file的读取节奏保持一致。
+    """
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._requests = None
+    
+    def __aiter__(self):
+        if self._requests is None:
+            import queue
+            import threading
+            self._requests = queue.SimpleQueue()
+            threading.Thread(
+                target=self._read_lines, name="stdin-reader", daemon=True
+            ).start()
+        return self
+    
+    async def __anext__(self):
+        future = asyncio.get_running_loop().create_future()
+        self._requests.put(future)
+        line = await future
+        if not line:
+            raise StopAsyncIteration
+        return line
+    
+    def _read_lines(self):
+        while True:
+            future = self._requests.get()
+            try:
+                line = self._stream.readline()
+            except (OSError, ValueError) as e:
+                # 文件描述符已关闭或无效，按输入结束处理；非法字节已由
+                # buffered_stdio_server的errors="replace"替换，不会走到这里
+                logger.error("Failed to read from stdin: %s", e)
+                line = ""
+            try:
+                future.get_loop().call_soon_threadsafe(_resolve_future, future, line)
+            except RuntimeError:
+                # 事件循环已关闭
+                return
+            if not line:
+                # 空字符串表示输入结束
+                return
+
+def _resolve_future(future, result):
+    if not future.done():
+        future.set_result(result)
+
+def buffered_stdio_server():
+    """使用更大缓冲区的stdin/stdout创建MCP stdio传输"""
+    import io
+    import anyio
+    import mcp.server.stdio
+    
+    try:
+        stdin_fd = sys.stdin.fileno()
+        stdout_fd = sys.stdout.fileno()
+    except (AttributeError, ValueError, io.UnsupportedOperation):
+        # stdin/stdout 已被替换成非文件对象时退回默认实现
+        return mcp.server.stdio.stdio_server()
+    
+    stdin = StdinLineReader(io.TextIOWrapper(
+        io.open(stdin_fd, "rb", buffering=STDIO_BUFFER_SIZE, closefd=False),
+        encoding="utf-8", errors="replace"
+    ))
+    stdout = anyio.wrap_file(io.TextIOWrapper(
+        io.open(stdout_fd, "wb", buffering=STDIO_BUFFER_SIZE, closefd=False),
+        encoding="utf-8"
+    ))
+    return mcp.server.stdio.stdio_server(stdin=stdin, stdout=stdout)
+
+def install_signal_handlers() -> asyncio.Event:
+    """注册SIGINT/SIGTERM处理器，返回收到信号时被置位的事件"""
+    import signal
+    
+    shutdown_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, shutdown_event.set)
+        except (NotImplementedError, RuntimeError):
+            # Windows事件循环不支持add_signal_handler，保留默认的KeyboardInterrupt行为
+            pass
+    return shutdown_event
+
+async def run_mcp_server(db_path: str = ":memory:", uri: bool = False):
+    """运行MCP服务器
+    
+    Args:
+        db_path: 数据库路径，默认使用内存数据库
+        uri: 是否将db_path作为SQLite URI（如 file:name?mode=memory&cache=shared）
+    """
     try:
         # 尝试导入MCP相关模块
-        from mcp.server import Server
+        from mcp.server import Server, NotificationOptions
         from mcp.server.models import InitializationOptions
-        import mcp.server.stdio
         import mcp.types as types
         
         from .memory_manager import MemoryManager
@@ -39,26 +246,59 @@ async def run_mcp_server():
         server = Server("ai-context-memory")
         
         # 初始化记忆管理器
-        memory_manager = MemoryManager(":memory:")  # 使用内存数据库作为默认
-        await memory_manager.initialize()
+        memory_manager = MemoryManager(db_path, uri=uri)
+        
+        # 数据库初始化在aiosqlite的后台线程中进行，先让它跑起来，
+        # 同时在当前线程注册工具（注册过程不访问数据库）
+        init_task = asyncio.create_task(memory_manager.initialize())
+        await asyncio.sleep(0)
+        try:
+            register_tools(server, memory_manager)
+        finally:
+            await init_task
+        
+        # 工具注册完成后计算一次服务器能力，运行时直接复用
+        capabilities = server.get_capabilities(
+            notification_options=NotificationOptions(),
+            experimental_capabilities={}
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Server capabilities: %r", capabilities)
+        
+        # 初始化选项只依赖固定参数，预先构建好
+        init_options = InitializationOptions(
+            server_name="ai-context-memory",
+            server_version="1.0.0",
+            capabilities=capabilities
+        )
+        
+        # 收到SIGINT/SIGTERM时通过事件通知主协程退出，而不是依赖KeyboardInterrupt
+        shutdown_event = install_signal_handlers()
         
-        # 注册工具
-        register_tools(server, memory_manager)
+        async def serve():
+            async with buffered_stdio_server() as (read_stream, write_stream):
+                await server.run(read_stream, write_stream, init_options)
         
-        # 运行服务器
-        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-            await server.run(
-                read_stream,
-                write_stream,
-                InitializationOptions(
-                    server_name="ai-context-memory",
-                    server_version="1.0.0",
-                    capabilities=server.get_capabilities(
-                        notification_options=None,
-                        experimental_capabilities={}
-                    )
-                )
+        # 运行服务器，直到stdin关闭或收到退出信号
+        try:
+            server_task = asyncio.create_task(serve())
+            shutdown_task = asyncio.create_task(shutdown_event.wait())
+            done, pending = await asyncio.wait(
+                {server_task, shutdown_task},
+                return_when=asyncio.FIRST_COMPLETED
             )
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            
+            if shutdown_task in done:
+                logger.info("Shutdown signal received, stopping server")
+            else:
+                # 传播服务器本身的异常
+                server_task.result()
+        finally:
+            await memory_manager.close()
+            flush_logging()
     
     except ImportError as e:
         print(f"❌ MCP依赖未安装: {e}")
@@ -70,19 +310,58 @@ async def run_mcp_server():
     
     return True
 
-def main():
-    """主入口函数"""
+# 命令行参数默认值，无参数快速路径与argparse共用
+DEFAULT_ARGUMENTS = {
+    "db_path": ":memory:",
+    "uri": False,
+    "log_level": "INFO",
+    "log_file": None,
+    "pin_cpu": None,
+    "nice": None,
+}
+LOG_LEVEL_CHOICES = tuple(LOG_LEVELS)
+
+@lru_cache(maxsize=None)
+def _build_parser():
+    """构建命令行解析器，只在首次需要时构建一次"""
+    import argparse
+    
     parser = argparse.ArgumentParser(description="AI Context Memory MCP Server")
-    parser.add_argument("--db-path", default=":memory:", help="数据库路径")
-    parser.add_argument("--log-level", default="INFO", help="日志级别")
+    parser.add_argument("--db-path", help="数据库路径")
+    parser.add_argument("--uri", action="store_true", help="将--db-path作为SQLite URI解析")
+    parser.add_argument("--log-level", type=str.upper, choices=LOG_LEVEL_CHOICES,
+                        help="日志级别")
+    parser.add_argument("--log-file", help="日志文件路径")
+    parser.add_argument("--pin-cpu", type=int, metavar="N", help="将进程绑定到第N个CPU核心")
+    parser.add_argument("--nice", type=int, help="调整进程优先级（nice增量）")
+    parser.set_defaults(**DEFAULT_ARGUMENTS)
+    return parser
+
+def parse_arguments(argv=None):
+    """解析命令行参数
+    
+    Args:
+        argv: 参数列表（不含程序名），默认取sys.argv[1:]
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    # MCP客户端通常不带任何参数启动服务器，此时无需构建解析器
+    if not argv:
+        from types import SimpleNamespace
+        return SimpleNamespace(**DEFAULT_ARGUMENTS)
     
-    args = parser.parse_args()
+    return _build_parser().parse_args(argv)
+
+def main():
+    """主入口函数"""
+    args = parse_arguments()
     
     # 设置日志
-    logging.basicConfig(
-        level=getattr(logging, args.log_level.upper()),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+    setup_logging(args.log_level, args.log_file)
+    
+    # 进程调优（默认不做任何调整）
+    tune_process(args.pin_cpu, args.nice)
     
     # 设置路径
     setup_paths()
@@ -90,13 +369,17 @@ def main():
     print("🚀 AI Context Memory MCP Server")
     print("=" * 40)
     
+    install_uvloop()
+    
     try:
-        asyncio.run(run_mcp_server())
+        asyncio.run(run_mcp_server(args.db_path, args.uri))
     except KeyboardInterrupt:
         print("\n👋 服务器已停止")
     except Exception as e:
         print(f"❌ 启动失败: {e}")
         sys.exit(1)
+    finally:
+        flush_logging()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
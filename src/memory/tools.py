@@ -2,10 +2,11 @@
 MCP tool definitions for AI Context Memory.
 """
 
+from functools import wraps
 from typing import Any, Dict, List, Optional
 import json
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 import mcp.types as types
 from mcp.server import Server
@@ -18,723 +19,793 @@ except ImportError:
     from memory_manager import MemoryManager
     from models import MemoryType
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
-def validate_required_param(arguments: Dict[str, Any], param_name: str, param_type: type = str):
-    """Validate that a required parameter exists and has the correct type."""
-    if param_name not in arguments:
-        raise ValueError(f"Missing required parameter: {param_name}")
-    
-    value = arguments[param_name]
-    if not isinstance(value, param_type):
-        raise ValueError(f"Parameter '{param_name}' must be of type {param_type.__name__}, got {type(value).__name__}")
-    
-    return value
+# JSON Schema type names used in the tool input schemas
+_JSON_TYPES = {
+    "string": str,
+    "integer": int,
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+}
+# bool subclasses int, but JSON Schema does not count true/false as numbers
+_NUMERIC_JSON_TYPES = {"integer", "number"}
+
+def _compile_type(type_name: str):
+    """Return (python type, rejects bool) for a JSON Schema type name."""
+    return _JSON_TYPES[type_name], type_name in _NUMERIC_JSON_TYPES
 
-def validate_optional_param(arguments: Dict[str, Any], param_name: str, param_type: type = str, default=None):
-    """Validate an optional parameter if it exists."""
-    if param_name not in arguments:
-        return default
+def _is_instance(value, compiled_type) -> bool:
+    expected_type, rejects_bool = compiled_type
+    return isinstance(value, expected_type) and not (rejects_bool and isinstance(value, bool))
+
+def compile_validator(schema: Dict[str, Any]):
+    """Compile a tool inputSchema into a single argument-checking function.
     
-    value = arguments[param_name]
-    if value is None:
-        return default
+    The schema is walked once here; the returned function checks the
+    presence and type of each declared property, plus the "enum",
+    "minimum" and array "items" type keywords the tool schemas use. It
+    returns a dict holding the non-null values that were supplied.
+    """
+    required = set(schema.get("required", ()))
+    checks = tuple(
+        (
+            name,
+            _compile_type(spec["type"]),
+            name in required,
+            tuple(spec["enum"]) if "enum" in spec else None,
+            spec.get("minimum"),
+            _compile_type(spec["items"]["type"]) if "items" in spec else None,
+        )
+        for name, spec in schema.get("properties", {}).items()
+    )
     
-    if not isinstance(value, param_type):
-        raise ValueError(f"Parameter '{param_name}' must be of type {param_type.__name__}, got {type(value).__name__}")
+    def validate(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        values = {}
+        for name, value_type, is_required, enum, minimum, item_type in checks:
+            if name not in arguments:
+                if is_required:
+                    raise ValueError(f"Missing required parameter: {name}")
+                continue
+            value = arguments[name]
+            if value is None and not is_required:
+                continue
+            if not _is_instance(value, value_type):
+                raise ValueError(f"Parameter '{name}' must be of type {value_type[0].__name__}, got {type(value).__name__}")
+            if enum is not None and value not in enum:
+                raise ValueError(f"Parameter '{name}' must be one of: {', '.join(map(str, enum))}")
+            if minimum is not None and value < minimum:
+                raise ValueError(f"Parameter '{name}' must be at least {minimum}")
+            if item_type is not None:
+                for item in value:
+                    if not _is_instance(item, item_type):
+                        raise ValueError(f"Items of '{name}' must be of type {item_type[0].__name__}, got {type(item).__name__}")
+            values[name] = value
+        return values
     
-    return value
+    return validate
+
+# Memory type values mapped to their enum members
+_MEMORY_TYPE_BY_STR = {m.value: m for m in MemoryType}
+_VALID_MEMORY_TYPES = tuple(_MEMORY_TYPE_BY_STR)
+_INVALID_MEMORY_TYPE_SUFFIX = f" (valid: {', '.join(_VALID_MEMORY_TYPES)})"
+
+def parse_memory_type(memory_type_str: str) -> MemoryType:
+    """Convert a memory type string to its enum member with one dict lookup."""
+    memory_type = _MEMORY_TYPE_BY_STR.get(memory_type_str)
+    if memory_type is None:
+        raise ValueError("Invalid memory type: " + str(memory_type_str) + _INVALID_MEMORY_TYPE_SUFFIX)
+    return memory_type
 
 def format_memory_for_output(memory) -> str:
     """Format a memory object for text output."""
-    output = f"ID: {memory.id}\n"
-    output += f"Content: {memory.content}\n"
-    output += f"Type: {memory.memory_type.value}\n"
+    parts = [
+        f"ID: {memory.id}\n",
+        f"Content: {memory.content}\n",
+        f"Type: {memory.memory_type.value}\n",
+    ]
     
     if memory.context:
-        output += f"Context: {memory.context}\n"
+        parts.append(f"Context: {memory.context}\n")
     
     if memory.tags:
-        output += f"Tags: {', '.join(memory.tags)}\n"
+        parts.append(f"Tags: {', '.join(memory.tags)}\n")
     
     if memory.created_at:
-        output += f"Created: {memory.created_at.isoformat()}\n"
+        parts.append(f"Created: {memory.created_at_iso}\n")
     
     if memory.updated_at:
-        output += f"Updated: {memory.updated_at.isoformat()}\n"
+        parts.append(f"Updated: {memory.updated_at_iso}\n")
     
-    output += f"Access Count: {memory.access_count}\n"
+    parts.append(f"Access Count: {memory.access_count}\n")
     
     if memory.last_accessed:
-        output += f"Last Accessed: {memory.last_accessed.isoformat()}\n"
+        parts.append(f"Last Accessed: {memory.last_accessed_iso}\n")
     
-    return output
+    return "".join(parts)
 
-def register_tools(server: Server, memory_manager: MemoryManager):
-    """Register all MCP tools with the server."""
-    
-    @server.list_tools()
-    async def handle_list_tools() -> List[types.Tool]:
-        """List available tools."""
-        return [
-            types.Tool(
-                name="store_memory",
-                description="Store a new memory with content, type, optional tags and context",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "content": {
-                            "type": "string",
-                            "description": "The memory content to store"
-                        },
-                        "memory_type": {
-                            "type": "string",
-                            "enum": ["fact", "preference", "conversation", "note"],
-                            "description": "Type of memory"
-                        },
-                        "tags": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "Optional tags for the memory"
-                        },
-                        "context": {
-                            "type": "string",
-                            "description": "Optional context information"
-                        }
-                    },
-                    "required": ["content", "memory_type"]
-                }
-            ),
-            types.Tool(
-                name="retrieve_memories",
-                description="Retrieve memories based on a search query",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "Search query to find relevant memories"
-                        },
-                        "memory_type": {
-                            "type": "string",
-                            "enum": ["fact", "preference", "conversation", "note"],
-                            "description": "Optional filter by memory type"
-                        },
-                        "limit": {
-                            "type": "integer",
-                            "minimum": 1,
-                            "description": "Maximum number of memories to return"
-                        }
-                    },
-                    "required": ["query"]
-                }
-            ),
-            types.Tool(
-                name="search_memories",
-                description="Advanced search with multiple filters",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "keywords": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "Keywords to search for"
-                        },
-                        "memory_type": {
-                            "type": "string",
-                            "enum": ["fact", "preference", "conversation", "note"],
-                            "description": "Filter by memory type"
-                        },
-                        "tags": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "Filter by tags"
-                        },
-                        "match_all_tags": {
-                            "type": "boolean",
-                            "description": "Whether to match all tags (AND) or any tag (OR)"
-                        },
-                        "days_back": {
-                            "type": "integer",
-                            "minimum": 1,
-                            "description": "Search within the last N days"
-                        },
-                        "limit": {
-                            "type": "integer",
-                            "minimum": 1,
-                            "description": "Maximum number of memories to return"
-                        }
-                    },
-                    "required": []
+def format_memories_bulk(memories) -> str:
+    """Format a list of memories as numbered blocks joined in one pass."""
+    return "".join([
+        f"--- Memory {i} ---\n{format_memory_for_output(memory)}\n"
+        for i, memory in enumerate(memories, 1)
+    ])
+
+def _memory_record(memory) -> Dict[str, Any]:
+    """Plain dict form of a memory for JSON output."""
+    return {
+        "id": memory.id,
+        "content": memory.content,
+        "type": memory.memory_type.value,
+        "context": memory.context,
+        "tags": memory.tags,
+        "created_at": memory.created_at,
+        "updated_at": memory.updated_at,
+        "access_count": memory.access_count,
+        "last_accessed": memory.last_accessed,
+    }
+
+def _json_default(value):
+    # Stored timestamps are naive UTC, matching orjson's OPT_NAIVE_UTC output
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=timezone.utc).isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def format_memories_json(memories) -> str:
+    """Serialize memories as a JSON array, using orjson when it is installed."""
+    records = [_memory_record(memory) for memory in memories]
+    if orjson is not None:
+        return orjson.dumps(records, option=orjson.OPT_NAIVE_UTC).decode()
+    return json.dumps(records, default=_json_default, ensure_ascii=False, separators=(",", ":"))
+
+_ERROR_TEMPLATE = "Error %s: %s"
+
+def tool_errors(operation: str):
+    """Report exceptions from a tool handler as an error text response."""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(arguments: Dict[str, Any]) -> List[types.TextContent]:
+            try:
+                return await func(arguments)
+            except Exception as e:
+                logger.error("Error %s: %s", operation, e)
+                return [types.TextContent(
+                    type="text",
+                    text=_ERROR_TEMPLATE % (operation, e)
+                )]
+        return wrapper
+    return decorator
+
+# Tool definitions never change at runtime, so they are built once at import
+_TOOL_LIST = (
+    types.Tool(
+        name="store_memory",
+        description="Store a new memory with content, type, optional tags and context",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "content": {
+                    "type": "string",
+                    "description": "The memory content to store"
+                },
+                "memory_type": {
+                    "type": "string",
+                    "enum": ["fact", "preference", "conversation", "note"],
+                    "description": "Type of memory"
+                },
+                "tags": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Optional tags for the memory"
+                },
+                "context": {
+                    "type": "string",
+                    "description": "Optional context information"
                 }
-            ),
-            types.Tool(
-                name="list_memories",
-                description="List memories with optional filtering and pagination",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "memory_type": {
-                            "type": "string",
-                            "enum": ["fact", "preference", "conversation", "note"],
-                            "description": "Filter by memory type"
-                        },
-                        "limit": {
-                            "type": "integer",
-                            "minimum": 1,
-                            "description": "Maximum number of memories to return"
-                        },
-                        "offset": {
-                            "type": "integer",
-                            "minimum": 0,
-                            "description": "Number of memories to skip"
-                        }
-                    },
-                    "required": []
+            },
+            "required": ["content", "memory_type"]
+        }
+    ),
+    types.Tool(
+        name="retrieve_memories",
+        description="Retrieve memories based on a search query",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Search query to find relevant memories"
+                },
+                "memory_type": {
+                    "type": "string",
+                    "enum": ["fact", "preference", "conversation", "note"],
+                    "description": "Optional filter by memory type"
+                },
+                "limit": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "Maximum number of memories to return"
+                },
+                "output_format": {
+                    "type": "string",
+                    "enum": ["text", "json"],
+                    "description": "Output format for the results (default: text)"
+                },
+                "count_only": {
+                    "type": "boolean",
+                    "description": "Only return the number of matching memories"
                 }
-            ),
-            types.Tool(
-                name="get_memory",
-                description="Get a specific memory by ID",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "memory_id": {
-                            "type": "integer",
-                            "minimum": 1,
-                            "description": "ID of the memory to retrieve"
-                        }
-                    },
-                    "required": ["memory_id"]
+            },
+            "required": ["query"]
+        }
+    ),
+    types.Tool(
+        name="search_memories",
+        description="Advanced search with multiple filters",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "keywords": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Keywords to search for"
+                },
+                "memory_type": {
+                    "type": "string",
+                    "enum": ["fact", "preference", "conversation", "note"],
+                    "description": "Filter by memory type"
+                },
+                "tags": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Filter by tags"
+                },
+                "match_all_tags": {
+                    "type": "boolean",
+                    "description": "Whether to match all tags (AND) or any tag (OR)"
+                },
+                "days_back": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "Search within the last N days"
+                },
+                "limit": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "Maximum number of memories to return"
+                },
+                "output_format": {
+                    "type": "string",
+                    "enum": ["text", "json"],
+                    "description": "Output format for the results (default: text)"
+                },
+                "count_only": {
+                    "type": "boolean",
+                    "description": "Only return the number of matching memories"
                 }
-            ),
-            types.Tool(
-                name="update_memory",
-                description="Update an existing memory",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "memory_id": {
-                            "type": "integer",
-                            "minimum": 1,
-                            "description": "ID of the memory to update"
-                        },
-                        "content": {
-                            "type": "string",
-                            "description": "New content for the memory"
-                        },
-                        "context": {
-                            "type": "string",
-                            "description": "New context for the memory"
-                        },
-                        "tags": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "New tags for the memory"
-                        }
-                    },
-                    "required": ["memory_id"]
+            },
+            "required": []
+        }
+    ),
+    types.Tool(
+        name="list_memories",
+        description="List memories with optional filtering and pagination",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "memory_type": {
+                    "type": "string",
+                    "enum": ["fact", "preference", "conversation", "note"],
+                    "description": "Filter by memory type"
+                },
+                "limit": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "Maximum number of memories to return"
+                },
+                "offset": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "description": "Number of memories to skip"
+                },
+                "output_format": {
+                    "type": "string",
+                    "enum": ["text", "json"],
+                    "description": "Output format for the results (default: text)"
+                },
+                "count_only": {
+                    "type": "boolean",
+                    "description": "Only return the number of matching memories"
                 }
-            ),
-            types.Tool(
-                name="delete_memory",
-                description="Delete a specific memory by ID",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "memory_id": {
-                            "type": "integer",
-                            "minimum": 1,
-                            "description": "ID of the memory to delete"
-                        }
-                    },
-                    "required": ["memory_id"]
+            },
+            "required": []
+        }
+    ),
+    types.Tool(
+        name="get_memory",
+        description="Get a specific memory by ID",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "memory_id": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "ID of the memory to retrieve"
                 }
-            ),
-            types.Tool(
-                name="clear_memories",
-                description="Clear all memories or memories of a specific type",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "memory_type": {
-                            "type": "string",
-                            "enum": ["fact", "preference", "conversation", "note"],
-                            "description": "Optional: only clear memories of this type"
-                        },
-                        "confirm": {
-                            "type": "boolean",
-                            "description": "Must be true to confirm the operation"
-                        }
-                    },
-                    "required": ["confirm"]
+            },
+            "required": ["memory_id"]
+        }
+    ),
+    types.Tool(
+        name="update_memory",
+        description="Update an existing memory",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "memory_id": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "ID of the memory to update"
+                },
+                "content": {
+                    "type": "string",
+                    "description": "New content for the memory"
+                },
+                "context": {
+                    "type": "string",
+                    "description": "New context for the memory"
+                },
+                "tags": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "New tags for the memory"
                 }
-            ),
-            types.Tool(
-                name="get_memory_statistics",
-                description="Get comprehensive statistics about stored memories",
-                inputSchema={
-                    "type": "object",
-                    "properties": {},
-                    "required": []
+            },
+            "required": ["memory_id"]
+        }
+    ),
+    types.Tool(
+        name="delete_memory",
+        description="Delete a specific memory by ID",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "memory_id": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "ID of the memory to delete"
                 }
-            ),
-            types.Tool(
-                name="get_tags",
-                description="Get all available tags",
-                inputSchema={
-                    "type": "object",
-                    "properties": {},
-                    "required": []
+            },
+            "required": ["memory_id"]
+        }
+    ),
+    types.Tool(
+        name="clear_memories",
+        description="Clear all memories or memories of a specific type",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "memory_type": {
+                    "type": "string",
+                    "enum": ["fact", "preference", "conversation", "note"],
+                    "description": "Optional: only clear memories of this type"
+                },
+                "confirm": {
+                    "type": "boolean",
+                    "description": "Must be true to confirm the operation"
                 }
-            )
-        ]
+            },
+            "required": ["confirm"]
+        }
+    ),
+    types.Tool(
+        name="get_memory_statistics",
+        description="Get comprehensive statistics about stored memories",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    types.Tool(
+        name="get_tags",
+        description="Get all available tags",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    )
+)
+
+# Report templates for get_memory_statistics, filled from the stats dict
+_STATS_HEADER_TMPL = (
+    "Memory Statistics:\n\n"
+    "Memory Counts:\n"
+    "  Total: {total_count}\n"
+    "  Facts: {fact_count}\n"
+    "  Notes: {note_count}\n"
+    "  Preferences: {preference_count}\n"
+    "  Conversations: {conversation_count}\n\n"
+    "Tags: {total_tags} unique tags\n\n"
+)
+_STATS_DETAIL_TMPL = (
+    "Access Statistics:\n"
+    "  Average access count: {avg_access_count:.2f}\n"
+    "  Max access count: {max_access_count}\n"
+    "  Min access count: {min_access_count}\n\n"
+    "Content Statistics:\n"
+    "  Average content length: {avg_content_length:.1f} characters\n"
+    "  Max content length: {max_content_length} characters\n"
+    "  Min content length: {min_content_length} characters\n\n"
+    "Tag Usage:\n"
+    "  Memories with tags: {memories_with_tags}\n"
+    "  Memories without tags: {memories_without_tags}\n\n"
+)
+_STATS_DATE_RANGE_TMPL = (
+    "Date Range:\n"
+    "  Oldest memory: {oldest_memory}\n"
+    "  Newest memory: {newest_memory}\n"
+)
+
+# Fixed responses are built once; the SDK copies the returned list and only
+# serializes its items, so handlers can return these objects directly
+_CANCELLED = [types.TextContent(
+    type="text",
+    text="Operation cancelled. Set 'confirm' to true to proceed with clearing memories."
+)]
+_NO_MATCHING_MEMORIES = [types.TextContent(type="text", text="No memories found matching the query.")]
+_NO_SEARCH_RESULTS = [types.TextContent(type="text", text="No memories found matching the search criteria.")]
+_NO_MEMORIES = [types.TextContent(type="text", text="No memories found.")]
+_NO_TAGS = [types.TextContent(type="text", text="No tags found.")]
+
+# One compiled argument validator per tool, keyed by tool name
+_VALIDATORS = {tool.name: compile_validator(tool.inputSchema) for tool in _TOOL_LIST}
+
+def register_tools(server: Server, memory_manager: MemoryManager):
+    """Register all MCP tools with the server."""
     
-    @server.call_tool()
+    @server.list_tools()
+    async def handle_list_tools() -> List[types.Tool]:
+        """List available tools."""
+        return list(_TOOL_LIST)
+    
+    @tool_errors("storing memory")
     async def store_memory(arguments: Dict[str, Any]) -> List[types.TextContent]:
         """Store a new memory."""
-        try:
-            # Validate required parameters
-            content = validate_required_param(arguments, "content", str)
-            memory_type_str = validate_required_param(arguments, "memory_type", str)
-            
-            # Validate optional parameters
-            tags = validate_optional_param(arguments, "tags", list, [])
-            context = validate_optional_param(arguments, "context", str)
-            
-            # Convert memory type string to enum
-            try:
-                memory_type = MemoryType(memory_type_str)
-            except ValueError:
-                raise ValueError(f"Invalid memory type: {memory_type_str}")
-            
-            # Store the memory
-            memory_id = await memory_manager.store_memory(
-                content=content,
-                memory_type=memory_type,
-                tags=tags,
-                context=context
-            )
-            
-            return [types.TextContent(
-                type="text",
-                text=f"Memory stored successfully with ID: {memory_id}"
-            )]
-            
-        except Exception as e:
-            logger.error(f"Error storing memory: {e}")
-            return [types.TextContent(
-                type="text",
-                text=f"Error storing memory: {str(e)}"
-            )]
+        # Validate parameters against the tool schema
+        args = _VALIDATORS["store_memory"](arguments)
+        content = args["content"]
+        memory_type_str = args["memory_type"]
+        tags = tuple(args.get("tags", ()))
+        context = args.get("context")
+        
+        # Convert memory type string to enum
+        memory_type = parse_memory_type(memory_type_str)
+        
+        # Store the memory
+        memory_id = await memory_manager.store_memory(
+            content=content,
+            memory_type=memory_type,
+            tags=tags,
+            context=context
+        )
+        
+        return [types.TextContent(
+            type="text",
+            text=f"Memory stored successfully with ID: {memory_id}"
+        )]
     
-    @server.call_tool()
+    @tool_errors("retrieving memories")
     async def retrieve_memories(arguments: Dict[str, Any]) -> List[types.TextContent]:
         """Retrieve memories based on query."""
-        try:
-            # Validate required parameters
-            query = validate_required_param(arguments, "query", str)
-            
-            # Validate optional parameters
-            memory_type_str = validate_optional_param(arguments, "memory_type", str)
-            limit = validate_optional_param(arguments, "limit", int)
-            
-            # Convert memory type if provided
-            memory_type = None
-            if memory_type_str:
-                try:
-                    memory_type = MemoryType(memory_type_str)
-                except ValueError:
-                    raise ValueError(f"Invalid memory type: {memory_type_str}")
-            
-            # Retrieve memories
-            memories = await memory_manager.retrieve_memories(
-                query=query,
-                memory_type=memory_type,
-                limit=limit
-            )
-            
-            if not memories:
-                return [types.TextContent(
-                    type="text",
-                    text="No memories found matching the query."
-                )]
-            
-            # Format output
-            output = f"Found {len(memories)} memories:\n\n"
-            for i, memory in enumerate(memories, 1):
-                output += f"--- Memory {i} ---\n"
-                output += format_memory_for_output(memory)
-                output += "\n"
-            
+        # Validate parameters against the tool schema
+        args = _VALIDATORS["retrieve_memories"](arguments)
+        query = args["query"]
+        memory_type_str = args.get("memory_type")
+        limit = args.get("limit")
+        output_format = args.get("output_format")
+        count_only = args.get("count_only", False)
+        
+        # Convert memory type if provided
+        memory_type = None
+        if memory_type_str:
+            memory_type = parse_memory_type(memory_type_str)
+        
+        # Retrieve memories
+        memories = await memory_manager.retrieve_memories(
+            query=query,
+            memory_type=memory_type,
+            limit=limit
+        )
+        
+        if count_only:
+            return [types.TextContent(type="text", text=f"Found {len(memories)} memories.")]
+        
+        if output_format == "json":
             return [types.TextContent(
                 type="text",
-                text=output
-            )]
-            
-        except Exception as e:
-            logger.error(f"Error retrieving memories: {e}")
-            return [types.TextContent(
-                type="text",
-                text=f"Error retrieving memories: {str(e)}"
+                text=format_memories_json(memories)
             )]
+        
+        if not memories:
+            return _NO_MATCHING_MEMORIES
+        
+        # Format output
+        return [types.TextContent(
+            type="text",
+            text=f"Found {len(memories)} memories:\n\n" + format_memories_bulk(memories)
+        )]
     
-    @server.call_tool()
+    @tool_errors("searching memories")
     async def search_memories(arguments: Dict[str, Any]) -> List[types.TextContent]:
         """Search memories with advanced filters."""
-        try:
-            # Validate optional parameters
-            keywords = validate_optional_param(arguments, "keywords", list)
-            memory_type_str = validate_optional_param(arguments, "memory_type", str)
-            tags = validate_optional_param(arguments, "tags", list)
-            match_all_tags = validate_optional_param(arguments, "match_all_tags", bool, False)
-            days_back = validate_optional_param(arguments, "days_back", int)
-            limit = validate_optional_param(arguments, "limit", int)
-            
-            # Convert memory type if provided
-            memory_type = None
-            if memory_type_str:
-                try:
-                    memory_type = MemoryType(memory_type_str)
-                except ValueError:
-                    raise ValueError(f"Invalid memory type: {memory_type_str}")
-            
-            # Calculate date range if days_back is provided
-            date_from = None
-            if days_back:
-                from datetime import timedelta
-                date_from = datetime.now() - timedelta(days=days_back)
-            
-            # Perform search
-            if tags and not keywords:
-                # Tag-based search
-                memories = await memory_manager.get_memories_by_tags(
-                    tags=tags,
-                    match_all=match_all_tags,
-                    memory_type=memory_type,
-                    limit=limit
-                )
-            elif keywords and not tags:
-                # Keyword-based search
-                memories = await memory_manager.search_memories_by_keywords(
-                    keywords=keywords,
-                    match_all=False,  # Use OR logic for keywords
-                    memory_type=memory_type,
-                    limit=limit
-                )
-            else:
-                # Advanced search with multiple filters
-                memories = await memory_manager.search_memories(
-                    keywords=keywords,
-                    memory_type=memory_type,
-                    tags=tags,
-                    date_from=date_from,
-                    limit=limit
-                )
-            
-            if not memories:
-                return [types.TextContent(
-                    type="text",
-                    text="No memories found matching the search criteria."
-                )]
-            
-            # Format output
-            output = f"Found {len(memories)} memories:\n\n"
-            for i, memory in enumerate(memories, 1):
-                output += f"--- Memory {i} ---\n"
-                output += format_memory_for_output(memory)
-                output += "\n"
-            
-            return [types.TextContent(
-                type="text",
-                text=output
-            )]
-            
-        except Exception as e:
-            logger.error(f"Error searching memories: {e}")
+        # Validate parameters against the tool schema
+        args = _VALIDATORS["search_memories"](arguments)
+        keywords = tuple(args.get("keywords", ()))
+        memory_type_str = args.get("memory_type")
+        tags = tuple(args.get("tags", ()))
+        match_all_tags = args.get("match_all_tags", False)
+        days_back = args.get("days_back")
+        limit = args.get("limit")
+        output_format = args.get("output_format")
+        count_only = args.get("count_only", False)
+        
+        # Convert memory type if provided
+        memory_type = None
+        if memory_type_str:
+            memory_type = parse_memory_type(memory_type_str)
+        
+        # Calculate date range if days_back is provided
+        date_from = None
+        if days_back:
+            # created_at is stored as UTC by CURRENT_TIMESTAMP
+            date_from = datetime.utcnow() - timedelta(days=days_back)
+        
+        # Perform search
+        memories = await memory_manager.unified_search(
+            keywords=keywords,
+            tags=tags,
+            memory_type=memory_type,
+            match_all_tags=match_all_tags,
+            date_from=date_from,
+            limit=limit
+        )
+        
+        if count_only:
+            return [types.TextContent(type="text", text=f"Found {len(memories)} memories.")]
+        
+        if output_format == "json":
             return [types.TextContent(
                 type="text",
-                text=f"Error searching memories: {str(e)}"
+                text=format_memories_json(memories)
             )]
+        
+        if not memories:
+            return _NO_SEARCH_RESULTS
+        
+        # Format output
+        return [types.TextContent(
+            type="text",
+            text=f"Found {len(memories)} memories:\n\n" + format_memories_bulk(memories)
+        )]
     
-    @server.call_tool()
+    @tool_errors("listing memories")
     async def list_memories(arguments: Dict[str, Any]) -> List[types.TextContent]:
         """List all memories with optional filtering."""
-        try:
-            # Validate optional parameters
-            memory_type_str = validate_optional_param(arguments, "memory_type", str)
-            limit = validate_optional_param(arguments, "limit", int)
-            offset = validate_optional_param(arguments, "offset", int)
-            
-            # Convert memory type if provided
-            memory_type = None
-            if memory_type_str:
-                try:
-                    memory_type = MemoryType(memory_type_str)
-                except ValueError:
-                    raise ValueError(f"Invalid memory type: {memory_type_str}")
-            
-            # List memories
-            memories = await memory_manager.list_memories(
-                memory_type=memory_type,
-                limit=limit,
-                offset=offset
+        # Validate parameters against the tool schema
+        args = _VALIDATORS["list_memories"](arguments)
+        memory_type_str = args.get("memory_type")
+        limit = args.get("limit")
+        offset = args.get("offset")
+        output_format = args.get("output_format")
+        count_only = args.get("count_only", False)
+        
+        # Convert memory type if provided
+        memory_type = None
+        if memory_type_str:
+            memory_type = parse_memory_type(memory_type_str)
+        
+        if count_only:
+            # Count in the database instead of loading the rows
+            count = await memory_manager.get_memory_count(
+                memory_type, limit=limit, offset=offset
             )
-            
-            if not memories:
-                return [types.TextContent(
-                    type="text",
-                    text="No memories found."
-                )]
-            
-            # Format output
-            output = f"Found {len(memories)} memories:\n\n"
-            for i, memory in enumerate(memories, 1):
-                output += f"--- Memory {i} ---\n"
-                output += format_memory_for_output(memory)
-                output += "\n"
-            
+            return [types.TextContent(type="text", text=f"Found {count} memories.")]
+        
+        # List memories
+        memories = await memory_manager.list_memories(
+            memory_type=memory_type,
+            limit=limit,
+            offset=offset
+        )
+        
+        if output_format == "json":
             return [types.TextContent(
                 type="text",
-                text=output
-            )]
-            
-        except Exception as e:
-            logger.error(f"Error listing memories: {e}")
-            return [types.TextContent(
-                type="text",
-                text=f"Error listing memories: {str(e)}"
+                text=format_memories_json(memories)
             )]
+        
+        if not memories:
+            return _NO_MEMORIES
+        
+        # Format output
+        return [types.TextContent(
+            type="text",
+            text=f"Found {len(memories)} memories:\n\n" + format_memories_bulk(memories)
+        )]
     
-    @server.call_tool()
+    @tool_errors("getting memory")
     async def get_memory(arguments: Dict[str, Any]) -> List[types.TextContent]:
         """Get a specific memory by ID."""
-        try:
-            # Validate required parameters
-            memory_id = validate_required_param(arguments, "memory_id", int)
-            
-            # Get the memory
-            memory = await memory_manager.get_memory_by_id(memory_id)
-            
-            if not memory:
-                return [types.TextContent(
-                    type="text",
-                    text=f"Memory with ID {memory_id} not found."
-                )]
-            
-            # Format output
-            output = format_memory_for_output(memory)
-            
+        # Validate parameters against the tool schema
+        args = _VALIDATORS["get_memory"](arguments)
+        memory_id = args["memory_id"]
+        
+        # Get the memory
+        memory = await memory_manager.get_memory_by_id(memory_id)
+        
+        if not memory:
             return [types.TextContent(
                 type="text",
-                text=output
-            )]
-            
-        except Exception as e:
-            logger.error(f"Error getting memory: {e}")
-            return [types.TextContent(
-                type="text",
-                text=f"Error getting memory: {str(e)}"
+                text=f"Memory with ID {memory_id} not found."
             )]
+        
+        # Format output
+        output = format_memory_for_output(memory)
+        
+        return [types.TextContent(
+            type="text",
+            text=output
+        )]
     
-    @server.call_tool()
+    @tool_errors("updating memory")
     async def update_memory(arguments: Dict[str, Any]) -> List[types.TextContent]:
         """Update an existing memory."""
-        try:
-            # Validate required parameters
-            memory_id = validate_required_param(arguments, "memory_id", int)
-            
-            # Validate optional parameters
-            content = validate_optional_param(arguments, "content", str)
-            context = validate_optional_param(arguments, "context", str)
-            tags = validate_optional_param(arguments, "tags", list)
-            
-            # At least one field must be provided for update
-            if not any([content, context is not None, tags is not None]):
-                raise ValueError("At least one field (content, context, or tags) must be provided for update")
-            
-            # Update the memory
-            success = await memory_manager.update_memory(
-                memory_id=memory_id,
-                content=content,
-                context=context,
-                tags=tags
-            )
-            
-            if success:
-                return [types.TextContent(
-                    type="text",
-                    text=f"Memory {memory_id} updated successfully."
-                )]
-            else:
-                return [types.TextContent(
-                    type="text",
-                    text=f"Memory with ID {memory_id} not found."
-                )]
-            
-        except Exception as e:
-            logger.error(f"Error updating memory: {e}")
+        # Validate parameters against the tool schema
+        args = _VALIDATORS["update_memory"](arguments)
+        memory_id = args["memory_id"]
+        content = args.get("content")
+        context = args.get("context")
+        tags = args.get("tags")
+        
+        # At least one field must be provided for update
+        if content is None and context is None and tags is None:
+            raise ValueError("At least one field (content, context, or tags) must be provided for update")
+        
+        # Update the memory
+        success = await memory_manager.update_memory(
+            memory_id=memory_id,
+            content=content,
+            context=context,
+            tags=tags
+        )
+        
+        if success:
             return [types.TextContent(
                 type="text",
-                text=f"Error updating memory: {str(e)}"
+                text=f"Memory {memory_id} updated successfully."
+            )]
+        else:
+            return [types.TextContent(
+                type="text",
+                text=f"Memory with ID {memory_id} not found."
             )]
     
-    @server.call_tool()
+    @tool_errors("deleting memory")
     async def delete_memory(arguments: Dict[str, Any]) -> List[types.TextContent]:
         """Delete a specific memory."""
-        try:
-            # Validate required parameters
-            memory_id = validate_required_param(arguments, "memory_id", int)
-            
-            # Delete the memory
-            success = await memory_manager.delete_memory(memory_id)
-            
-            if success:
-                return [types.TextContent(
-                    type="text",
-                    text=f"Memory {memory_id} deleted successfully."
-                )]
-            else:
-                return [types.TextContent(
-                    type="text",
-                    text=f"Memory with ID {memory_id} not found."
-                )]
-            
-        except Exception as e:
-            logger.error(f"Error deleting memory: {e}")
+        # Validate parameters against the tool schema
+        args = _VALIDATORS["delete_memory"](arguments)
+        memory_id = args["memory_id"]
+        
+        # Delete the memory
+        success = await memory_manager.delete_memory(memory_id)
+        
+        if success:
             return [types.TextContent(
                 type="text",
-                text=f"Error deleting memory: {str(e)}"
+                text=f"Memory {memory_id} deleted successfully."
             )]
-    
-    @server.call_tool()
-    async def clear_memories(arguments: Dict[str, Any]) -> List[types.TextContent]:
-        """Clear all memories or memories of a specific type."""
-        try:
-            # Validate required parameters
-            confirm = validate_required_param(arguments, "confirm", bool)
-            
-            if not confirm:
-                return [types.TextContent(
-                    type="text",
-                    text="Operation cancelled. Set 'confirm' to true to proceed with clearing memories."
-                )]
-            
-            # Validate optional parameters
-            memory_type_str = validate_optional_param(arguments, "memory_type", str)
-            
-            # Convert memory type if provided
-            memory_type = None
-            if memory_type_str:
-                try:
-                    memory_type = MemoryType(memory_type_str)
-                except ValueError:
-                    raise ValueError(f"Invalid memory type: {memory_type_str}")
-            
-            # Clear memories
-            cleared_count = await memory_manager.clear_memories(memory_type)
-            
-            if memory_type:
-                return [types.TextContent(
-                    type="text",
-                    text=f"Cleared {cleared_count} memories of type '{memory_type.value}'."
-                )]
-            else:
-                return [types.TextContent(
-                    type="text",
-                    text=f"Cleared all {cleared_count} memories."
-                )]
-            
-        except Exception as e:
-            logger.error(f"Error clearing memories: {e}")
+        else:
             return [types.TextContent(
                 type="text",
-                text=f"Error clearing memories: {str(e)}"
+                text=f"Memory with ID {memory_id} not found."
             )]
     
-    @server.call_tool()
-    async def get_memory_statistics(arguments: Dict[str, Any]) -> List[types.TextContent]:
-        """Get comprehensive statistics about stored memories."""
-        try:
-            # Get statistics
-            stats = await memory_manager.get_memory_statistics()
-            
-            # Format output
-            output = "Memory Statistics:\n\n"
-            
-            # Memory counts
-            output += "Memory Counts:\n"
-            output += f"  Total: {stats['total_count']}\n"
-            output += f"  Facts: {stats['fact_count']}\n"
-            output += f"  Notes: {stats['note_count']}\n"
-            output += f"  Preferences: {stats['preference_count']}\n"
-            output += f"  Conversations: {stats['conversation_count']}\n\n"
-            
-            # Tag statistics
-            output += f"Tags: {stats['total_tags']} unique tags\n\n"
-            
-            if stats['total_count'] > 0:
-                # Access statistics
-                output += "Access Statistics:\n"
-                output += f"  Average access count: {stats['avg_access_count']:.2f}\n"
-                output += f"  Max access count: {stats['max_access_count']}\n"
-                output += f"  Min access count: {stats['min_access_count']}\n\n"
-                
-                # Content statistics
-                output += "Content Statistics:\n"
-                output += f"  Average content length: {stats['avg_content_length']:.1f} characters\n"
-                output += f"  Max content length: {stats['max_content_length']} characters\n"
-                output += f"  Min content length: {stats['min_content_length']} characters\n\n"
-                
-                # Tag usage
-                output += "Tag Usage:\n"
-                output += f"  Memories with tags: {stats['memories_with_tags']}\n"
-                output += f"  Memories without tags: {stats['memories_without_tags']}\n\n"
-                
-                # Date range
-                if 'oldest_memory' in stats and 'newest_memory' in stats:
-                    output += "Date Range:\n"
-                    output += f"  Oldest memory: {stats['oldest_memory']}\n"
-                    output += f"  Newest memory: {stats['newest_memory']}\n"
-            
+    @tool_errors("clearing memories")
+    async def clear_memories(arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """Clear all memories or memories of a specific type."""
+        # Cancelled requests need no further validation
+        if arguments.get("confirm") is False:
+            return _CANCELLED
+        
+        # Validate parameters against the tool schema
+        args = _VALIDATORS["clear_memories"](arguments)
+        
+        memory_type_str = args.get("memory_type")
+        
+        # Convert memory type if provided
+        memory_type = None
+        if memory_type_str:
+            memory_type = parse_memory_type(memory_type_str)
+        
+        # Clear memories
+        cleared_count = await memory_manager.clear_memories(memory_type)
+        
+        if memory_type:
             return [types.TextContent(
                 type="text",
-                text=output
+                text=f"Cleared {cleared_count} memories of type '{memory_type.value}'."
             )]
-            
-        except Exception as e:
-            logger.error(f"Error getting statistics: {e}")
+        else:
             return [types.TextContent(
                 type="text",
-                text=f"Error getting statistics: {str(e)}"
+                text=f"Cleared all {cleared_count} memories."
             )]
     
-    @server.call_tool()
+    @tool_errors("getting statistics")
+    async def get_memory_statistics(arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """Get comprehensive statistics about stored memories."""
+        # Get statistics
+        stats = await memory_manager.get_memory_statistics()
+        
+        # Format output
+        parts = [_STATS_HEADER_TMPL.format_map(stats)]
+        
+        if stats['total_count'] > 0:
+            parts.append(_STATS_DETAIL_TMPL.format_map(stats))
+            
+            if 'oldest_memory' in stats and 'newest_memory' in stats:
+                parts.append(_STATS_DATE_RANGE_TMPL.format_map(stats))
+        
+        return [types.TextContent(
+            type="text",
+            text="".join(parts)
+        )]
+    
+    @tool_errors("getting tags")
     async def get_tags(arguments: Dict[str, Any]) -> List[types.TextContent]:
         """Get all available tags."""
-        try:
-            # Get all tags
-            tags = await memory_manager.get_all_tags()
-            
-            if not tags:
-                return [types.TextContent(
-                    type="text",
-                    text="No tags found."
-                )]
-            
-            # Format output
-            output = f"Available tags ({len(tags)}):\n\n"
-            for tag in sorted(tags):
-                output += f"  - {tag}\n"
-            
-            return [types.TextContent(
-                type="text",
-                text=output
-            )]
-            
-        except Exception as e:
-            logger.error(f"Error getting tags: {e}")
-            return [types.TextContent(
-                type="text",
-                text=f"Error getting tags: {str(e)}"
-            )]
\ No newline at end of file
+        # Get all tags
+        tags = await memory_manager.get_all_tags_sorted()
+        
+        if not tags:
+            return _NO_TAGS
+        
+        # Format output
+        output = f"Available tags ({len(tags)}):\n\n  - " + "\n  - ".join(tags) + "\n"
+        
+        return [types.TextContent(
+            type="text",
+            text=output
+        )]
+    
+    # Server.call_tool() keeps a single handler, so all tools share one
+    # dispatcher that resolves the tool by name with a dict lookup
+    dispatch = {
+        "store_memory": store_memory,
+        "retrieve_memories": retrieve_memories,
+        "search_memories": search_memories,
+        "list_memories": list_memories,
+        "get_memory": get_memory,
+        "update_memory": update_memory,
+        "delete_memory": delete_memory,
+        "clear_memories": clear_memories,
+        "get_memory_statistics": get_memory_statistics,
+        "get_tags": get_tags,
+    }
+    
+    @server.call_tool()
+    async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """Dispatch a tool call to its handler."""
+        handler = dispatch.get(name)
+        if handler is None:
+            raise ValueError(f"Unknown tool: {name}")
+        return await handler(arguments)
@@ -0,0 +1,32 @@
+"""
+MemoryManager caching tests.
+"""
+
+import asyncio
+
+from memory import MemoryManager, MemoryType
+
+
+def test_cached_retrieve_reflects_access_counts():
+    async def run():
+        manager = MemoryManager(":memory:")
+        await manager.initialize()
+        try:
+            first = await manager.store_memory("python tips", MemoryType.FACT)
+            second = await manager.store_memory("python more", MemoryType.FACT)
+            await manager.retrieve_memories("python")
+            
+            for _ in range(3):
+                await manager.get_memory_by_id(first)
+            cached = await manager.retrieve_memories("python")
+            listed = await manager.list_memories()
+            assert {m.id: m.access_count for m in cached} == {first: 3, second: 0}
+            assert {m.id: m.access_count for m in listed} == {first: 3, second: 0}
+            
+            await manager.update_memory_access_count(second)
+            cached = await manager.retrieve_memories("python")
+            assert {m.id: m.access_count for m in cached} == {first: 3, second: 1}
+        finally:
+            await manager.close()
+    
+    asyncio.run(run())
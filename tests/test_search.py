@@ -0,0 +1,65 @@
+"""
+Content search regression tests.
+"""
+
+import asyncio
+
+from memory import MemoryManager, MemoryType
+
+
+async def _manager_with_memories():
+    manager = MemoryManager(":memory:")
+    await manager.initialize()
+    ids = [
+        await manager.store_memory("héllo 咖啡", MemoryType.FACT),
+        await manager.store_memory("我喜欢喝咖啡", MemoryType.NOTE),
+        await manager.store_memory("python code", MemoryType.FACT),
+    ]
+    return manager, ids
+
+
+def test_retrieve_short_cjk_queries():
+    async def run():
+        manager, (first, second, _) = await _manager_with_memories()
+        try:
+            for query in ("咖啡", "咖"):
+                memories = await manager.retrieve_memories(query)
+                assert {m.id for m in memories} == {first, second}, query
+            memories = await manager.retrieve_memories("喜欢喝")
+            assert [m.id for m in memories] == [second]
+        finally:
+            await manager.close()
+    
+    asyncio.run(run())
+
+
+def test_keyword_search_short_patterns():
+    async def run():
+        manager, (first, second, third) = await _manager_with_memories()
+        try:
+            memories = await manager.search_memories_by_keywords(["py", "咖"])
+            assert {m.id for m in memories} == {first, second, third}
+            memories = await manager.search_memories_by_keywords(
+                ["咖", "喝"], match_all=True
+            )
+            assert [m.id for m in memories] == [second]
+        finally:
+            await manager.close()
+    
+    asyncio.run(run())
+
+
+def test_unified_search_short_cjk_keyword():
+    async def run():
+        manager, (first, second, _) = await _manager_with_memories()
+        try:
+            memories = await manager.unified_search(keywords=["咖"])
+            assert {m.id for m in memories} == {first, second}
+            memories = await manager.unified_search(
+                keywords=["咖啡"], memory_type=MemoryType.NOTE
+            )
+            assert [m.id for m in memories] == [second]
+        finally:
+            await manager.close()
+    
+    asyncio.run(run())